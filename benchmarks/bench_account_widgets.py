@@ -0,0 +1,55 @@
+"""Compare widget count and time-to-first-paint for eager vs. lazy credential panels.
+
+Needs a display (use xvfb-run on a headless machine). Run from the
+repository root:
+    python -m benchmarks.bench_account_widgets
+"""
+import argparse
+import tempfile
+import time
+
+import customtkinter as ctk
+
+from src.ui.widgets import AccountWidget
+from src.utils.data_manager import DataManager
+
+def count_widgets(widget):
+    """Count Tk widgets below widget, itself excluded."""
+    return sum(1 + count_widgets(child) for child in widget.winfo_children())
+
+def build(window, data_manager, count, eager):
+    container = ctk.CTkScrollableFrame(window)
+    container.pack(fill="both", expand=True)
+    start = time.perf_counter()
+    for i in range(count):
+        account = {"name": f"Player{i}", "id": f"id_{i}", "password": "x"}
+        widget = AccountWidget(container, account, lambda: None, data_manager)
+        if eager:
+            # What every row used to pay up front
+            widget._create_credentials_frame()
+    window.update()
+    elapsed = (time.perf_counter() - start) * 1000
+    widgets = count_widgets(container)
+    container.destroy()
+    window.update()
+    return elapsed, widgets
+
+def run(counts):
+    window = ctk.CTk()
+    with tempfile.TemporaryDirectory() as tmp:
+        data_manager = DataManager(tmp)
+        print(f"{'accounts':>9} {'mode':>6} {'first paint ms':>15} {'widgets':>8}")
+        for count in counts:
+            for mode in ("eager", "lazy"):
+                elapsed, widgets = build(window, data_manager, count, mode == "eager")
+                print(f"{count:>9} {mode:>6} {elapsed:>15.1f} {widgets:>8}")
+    window.destroy()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[50, 100, 200])
+    args = parser.parse_args()
+    run(args.counts)
+
+if __name__ == "__main__":
+    main()
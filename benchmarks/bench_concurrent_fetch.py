@@ -0,0 +1,57 @@
+"""Benchmark RankRefresher with OpGGService against a local stub server.
+
+Run from the repository root:
+    python -m benchmarks.bench_concurrent_fetch
+"""
+import argparse
+import tempfile
+import time
+
+from benchmarks.bench_persistence import make_data_manager
+from benchmarks.stub_server import StubServer
+from src.services.http_client import HttpClient
+from src.services.op_gg_service import OpGGService
+from src.services.rank_refresher import RankRefresher
+
+def run(servers, accounts_per_server, delay, concurrency_levels, max_per_server, fixture_dir):
+    stub = StubServer(delay=delay, fixture_dir=fixture_dir)
+    with stub, tempfile.TemporaryDirectory() as tmp:
+        print(f"{len(servers) * accounts_per_server} accounts, {delay * 1000:.0f} ms server latency")
+        print(f"{'workers':>8} {'per server':>11} {'seconds':>9} {'speedup':>8} {'connections':>12}")
+        baseline = None
+        for workers in concurrency_levels:
+            data_manager = make_data_manager(f"{tmp}/{workers}", servers, accounts_per_server)
+            http_client = HttpClient()
+            stub.connection_count = 0
+            provider = OpGGService(
+                f"{tmp}/{workers}/http_cache",
+                base_url=stub.base_url,
+                http_client=http_client
+            )
+            refresher = RankRefresher(
+                data_manager,
+                provider,
+                max_workers=workers,
+                max_per_server=max_per_server or workers
+            )
+            start = time.perf_counter()
+            refresher.update_all_ranks()
+            elapsed = time.perf_counter() - start
+            http_client.close()
+            baseline = baseline or elapsed
+            per_server = max_per_server or workers
+            print(f"{workers:>8} {per_server:>11} {elapsed:>9.3f} {baseline / elapsed:>7.1f}x {stub.connection_count:>12}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", nargs="+", default=["EUW", "EUNE", "NA"])
+    parser.add_argument("--accounts", type=int, default=50, help="accounts per server")
+    parser.add_argument("--delay", type=float, default=0.05, help="stub latency in seconds")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--per-server", type=int, default=None, help="per-server cap (default: same as workers)")
+    parser.add_argument("--fixtures", default=None, help="serve saved pages from this FixtureRankProvider directory")
+    args = parser.parse_args()
+    run(args.servers, args.accounts, args.delay, args.workers, args.per_server, args.fixtures)
+
+if __name__ == "__main__":
+    main()
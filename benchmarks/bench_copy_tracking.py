@@ -0,0 +1,52 @@
+"""Time the Copy click path: a save per click vs. the usage log.
+
+Measures DataManager.record_copy as AccountWidget calls it, without the
+clipboard.
+Run from the repository root:
+    python -m benchmarks.bench_copy_tracking
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+from benchmarks.bench_persistence import make_data_manager
+from src.utils.usage_log import UsageLog
+
+SERVERS = ["EUW", "NA"]
+
+def time_clicks(data_manager, clicks):
+    server = SERVERS[0]
+    accounts = data_manager.get_accounts(server)
+    samples = []
+    for i in range(clicks):
+        start = time.perf_counter()
+        data_manager.record_copy(server, accounts[i % len(accounts)]["id"], "id" if i % 2 else "password")
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6, max(samples) * 1e6
+
+def run(counts, clicks, storage):
+    print(f"{clicks} clicks, {storage} storage, microseconds per click")
+    print(f"{'accounts':>9} {'mode':>9} {'median':>9} {'max':>9} {'writes':>7}")
+    for count in counts:
+        for mode in ("save", "usage log"):
+            with tempfile.TemporaryDirectory() as tmp:
+                data_manager = make_data_manager(tmp, SERVERS, count // len(SERVERS), storage)
+                if mode == "usage log":
+                    data_manager.usage_log = UsageLog(data_manager)
+                median, worst = time_clicks(data_manager, clicks)
+                # Writes on the click path; the log saves later in the background
+                writes = data_manager.write_count
+                data_manager.close()
+                print(f"{count:>9} {mode:>9} {median:>9.1f} {worst:>9.1f} {writes:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000], help="total accounts")
+    parser.add_argument("--clicks", type=int, default=100)
+    parser.add_argument("--storage", choices=("json", "compact", "sqlite"), default="json")
+    args = parser.parse_args()
+    run(args.counts, args.clicks, args.storage)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Show network requests and bytes saved by the op.gg response cache.
+
+Runs three refreshes against a local stub server: a cold one, one
+inside the TTL, and one after the TTL has expired (conditional GETs).
+Run from the repository root:
+    python -m benchmarks.bench_http_cache
+"""
+import argparse
+import tempfile
+import time
+
+from benchmarks.bench_persistence import make_data_manager
+from benchmarks.stub_server import StubServer
+from src.services.http_client import HttpClient
+from src.services.op_gg_service import OpGGService
+from src.services.rank_refresher import RankRefresher
+
+def run(servers, accounts_per_server, delay):
+    with StubServer(delay=delay) as stub, tempfile.TemporaryDirectory() as tmp:
+        data_manager = make_data_manager(tmp, servers, accounts_per_server)
+        service = OpGGService(f"{tmp}/http_cache", base_url=stub.base_url, http_client=HttpClient())
+        refresher = RankRefresher(data_manager, service)
+        
+        print(f"{len(servers) * accounts_per_server} accounts, {delay * 1000:.0f} ms server latency")
+        print(f"{'refresh':>12} {'requests':>9} {'seconds':>9} {'hits':>6} {'304s':>6} {'misses':>7} {'bytes saved':>12}")
+        for label, ttl in (("cold", 600), ("within TTL", 600), ("expired", 0)):
+            service.cache.ttl = ttl
+            before_requests = stub.request_count
+            before = service.cache.stats()
+            start = time.perf_counter()
+            refresher.update_all_ranks()
+            elapsed = time.perf_counter() - start
+            after = service.cache.stats()
+            delta = {key: after[key] - before[key] for key in after}
+            print(
+                f"{label:>12} {stub.request_count - before_requests:>9} {elapsed:>9.3f} "
+                f"{delta['hits']:>6} {delta['revalidated']:>6} {delta['misses']:>7} {delta['bytes_saved']:>12}"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", nargs="+", default=["EUW", "EUNE", "NA"])
+    parser.add_argument("--accounts", type=int, default=50, help="accounts per server")
+    parser.add_argument("--delay", type=float, default=0.05, help="stub latency in seconds")
+    args = parser.parse_args()
+    run(args.servers, args.accounts, args.delay)
+
+if __name__ == "__main__":
+    main()
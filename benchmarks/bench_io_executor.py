@@ -0,0 +1,66 @@
+"""Time spent on the calling (Tk) thread by saves, inline vs. through the IOExecutor.
+
+Simulates a slow disk (antivirus scan, network drive) by delaying each
+write of accounts.json.
+Run from the repository root:
+    python -m benchmarks.bench_io_executor
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+from benchmarks.bench_persistence import make_data_manager
+from src.utils import io_executor
+from src.utils.io_executor import IOExecutor
+
+SERVERS = ["EUW"]
+
+def slow_down(storage, delay):
+    write = storage.write
+    def slow_write(payload):
+        time.sleep(delay)
+        write(payload)
+    storage.write = slow_write
+
+def rename(account):
+    account["name"] = account["name"] + "x"
+
+def run(accounts, actions, delay):
+    print(f"{accounts} accounts, {actions} renames, {delay * 1000:.0f} ms per disk write")
+    print(f"{'mode':>9} {'median ms':>10} {'max ms':>8} {'writes':>7} {'drain ms':>9}")
+    for mode in ("inline", "executor"):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_manager = make_data_manager(tmp, SERVERS, accounts)
+            slow_down(data_manager.storage, delay)
+            # Saves take no callbacks, so no Tk root is needed here
+            executor = IOExecutor(None) if mode == "executor" else None
+            io_executor._shared_executor = executor
+            try:
+                ids = [account["id"] for account in data_manager.get_accounts(SERVERS[0])]
+                samples = []
+                for i in range(actions):
+                    start = time.perf_counter()
+                    data_manager.update_account(SERVERS[0], ids[i % len(ids)], rename)
+                    samples.append(time.perf_counter() - start)
+                    # Leave time between clicks like a user would
+                    time.sleep(delay / 4)
+                start = time.perf_counter()
+                if executor:
+                    executor.shutdown()
+                drain = time.perf_counter() - start
+            finally:
+                io_executor._shared_executor = None
+            print(f"{mode:>9} {statistics.median(samples) * 1000:>10.2f} {max(samples) * 1000:>8.2f} "
+                  f"{data_manager.write_count:>7} {drain * 1000:>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--actions", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.2, help="seconds added to each disk write")
+    args = parser.parse_args()
+    run(args.accounts, args.actions, args.delay)
+
+if __name__ == "__main__":
+    main()
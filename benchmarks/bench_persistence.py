@@ -0,0 +1,68 @@
+"""Count accounts.json writes and time a full rank refresh, batched vs. unbatched.
+
+Run from the repository root:
+    python -m benchmarks.bench_persistence
+"""
+import argparse
+import tempfile
+import time
+
+from benchmarks.fixture_pages import make_profile_page, write_fixture_dir
+from src.services.rank_provider import FixtureRankProvider
+from src.services.rank_refresher import RankRefresher
+from src.utils.data_manager import DataManager
+
+class CountingDataManager(DataManager):
+    """DataManager that counts how often accounts.json is written."""
+    
+    def __init__(self, *args, **kwargs):
+        self.write_count = 0
+        super().__init__(*args, **kwargs)
+    
+    def _write_accounts(self):
+        self.write_count += 1
+        super()._write_accounts()
+
+def make_data_manager(data_dir, servers, accounts_per_server, storage=None):
+    data_manager = CountingDataManager(data_dir, storage=storage)
+    with data_manager.batch():
+        for server in servers:
+            data_manager.add_server(server)
+            for i in range(accounts_per_server):
+                data_manager.add_account(server, {
+                    "name": f"{server}Player{i}#{server}",
+                    "id": f"{server}_{i}",
+                    "password": "x"
+                })
+    data_manager.write_count = 0
+    return data_manager
+
+def run(servers, accounts_per_server, workers):
+    with tempfile.TemporaryDirectory() as tmp:
+        provider = FixtureRankProvider(
+            write_fixture_dir(f"{tmp}/fixtures", make_profile_page(filler_rows=0))
+        )
+        print(f"{len(servers) * accounts_per_server} accounts")
+        print(f"{'mode':>10} {'writes':>8} {'seconds':>9}")
+        for mode in ("unbatched", "batched"):
+            data_manager = make_data_manager(f"{tmp}/{mode}", servers, accounts_per_server)
+            refresher = RankRefresher(data_manager, provider, max_workers=workers)
+            start = time.perf_counter()
+            if mode == "batched":
+                refresher.update_all_ranks()
+            else:
+                # Bypass the batch to reproduce one write per mutation
+                refresher._update_ranks(refresher.select_accounts(), None)
+            elapsed = time.perf_counter() - start
+            print(f"{mode:>10} {data_manager.write_count:>8} {elapsed:>9.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", nargs="+", default=["EUW", "EUNE", "NA"])
+    parser.add_argument("--accounts", type=int, default=50, help="accounts per server")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    run(args.servers, args.accounts, args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Loading dialog redraws per refresh, one per account vs. a ProgressChannel.
+
+Worker threads report finished accounts as fast as a cached refresh does.
+Reporting straight to the dialog redraws once per account; the channel is
+drained every PROGRESS["REDRAW_MS"] and redraws once per drain. No display
+is needed: redraws are counted, not painted.
+Run from the repository root:
+    python -m benchmarks.bench_progress
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.constants import PROGRESS
+from src.utils.progress import ProgressChannel
+
+class CountingDialog:
+    """Stands in for LoadingDialog, counting redraws."""
+    
+    def __init__(self):
+        self.redraws = 0
+        self._lock = threading.Lock()
+    
+    def update_progress(self, account_name):
+        with self._lock:
+            self.redraws += 1
+
+def work(reporter, accounts, workers, delay):
+    def fetch(index):
+        time.sleep(delay)
+        reporter.update_progress(f"Player{index}#EUW")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(fetch, range(accounts)))
+
+def run(accounts, workers, delay):
+    print(f"{accounts} accounts, {workers} workers, {delay * 1000:.1f} ms per account")
+    print(f"{'mode':>8} {'redraws':>8} {'seconds':>8} {'last rate/s':>12}")
+    
+    dialog = CountingDialog()
+    start = time.perf_counter()
+    work(dialog, accounts, workers, delay)
+    print(f"{'direct':>8} {dialog.redraws:>8} {time.perf_counter() - start:>8.3f} {'-':>12}")
+    
+    channel = ProgressChannel(accounts)
+    redraws = 0
+    start = time.perf_counter()
+    thread = threading.Thread(target=lambda: [work(channel, accounts, workers, delay), channel.finish()])
+    thread.start()
+    # Same loop LoadingDialog.follow() runs through after()
+    while not channel.finished:
+        time.sleep(PROGRESS["REDRAW_MS"] / 1000)
+        if channel.drain() and channel.done:
+            redraws += 1
+    thread.join()
+    print(f"{'channel':>8} {redraws:>8} {time.perf_counter() - start:>8.3f} {channel.rate():>12.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=0.002, help="seconds per account")
+    args = parser.parse_args()
+    run(args.accounts, args.workers, args.delay)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Compare the lxml rank parser with the previous BeautifulSoup html.parser path.
+
+Reports per-page parse time and the increase in peak RSS while parsing
+(RSS is Linux only).
+Pass saved op.gg pages with --pages, otherwise a synthetic page is used.
+Run from the repository root:
+    python -m benchmarks.bench_rank_parser
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fixture_pages import make_profile_page
+from src.services.rank_parser import SOLO_SECTION_CLASS, FLEX_SECTION_CLASS, parse_ranks
+
+def parse_ranks_bs4(content):
+    """The previous parsing path from OpGGService.get_rank_info."""
+    soup = BeautifulSoup(content, 'html.parser')
+    result = {}
+    for queue, css_class in (("solo", SOLO_SECTION_CLASS), ("flex", FLEX_SECTION_CLASS)):
+        result[queue] = None
+        section = soup.find("div", {"class": css_class})
+        if section:
+            content_div = section.find("div", {"class": "content"})
+            if content_div:
+                info_div = content_div.find("div", {"class": "info"})
+                if info_div:
+                    tier_div = info_div.find("div", {"class": "tier"})
+                    lp_div = info_div.find("div", {"class": "lp"})
+                    if tier_div and lp_div:
+                        result[queue] = (tier_div.text.strip(), lp_div.text.strip())
+    return result
+
+PARSERS = {"bs4": parse_ranks_bs4, "lxml": parse_ranks}
+
+def load_pages(paths):
+    if not paths:
+        return [make_profile_page()]
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KiB (Linux only)."""
+    # VmHWM resets on exec, unlike ru_maxrss which a child inherits from its parent
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    raise OSError("VmHWM not available")
+
+def peak_rss_delta_kb(parser, paths):
+    """Peak RSS growth while parsing, measured in a fresh interpreter (None if unsupported)."""
+    code = (
+        "import sys\n"
+        "from benchmarks.bench_rank_parser import PARSERS, load_pages, peak_rss_kb\n"
+        "pages = load_pages(sys.argv[2:])\n"
+        "before = peak_rss_kb()\n"
+        "for page in pages: PARSERS[sys.argv[1]](page)\n"
+        "print(peak_rss_kb() - before)\n"
+    )
+    try:
+        output = subprocess.run(
+            [sys.executable, "-c", code, parser, *paths],
+            capture_output=True, text=True, check=True
+        ).stdout
+        return int(output.strip())
+    except (subprocess.CalledProcessError, ValueError):
+        return None
+
+def run(paths, repeat):
+    pages = load_pages(paths)
+    size_kb = sum(len(page) for page in pages) / len(pages) / 1024
+    print(f"{len(pages)} page(s), {size_kb:.0f} KiB average")
+    expected = parse_ranks_bs4(pages[0])
+    print(f"{'parser':>7} {'ms/page':>9} {'peak RSS +KiB':>14}  result")
+    for name, parser in PARSERS.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for page in pages:
+                result = parser(page)
+        per_page = (time.perf_counter() - start) * 1000 / (repeat * len(pages))
+        rss = peak_rss_delta_kb(name, paths)
+        rss_text = f"{rss:>14}" if rss is not None else f"{'n/a':>14}"
+        match = "ok" if parser(pages[0]) == expected else f"MISMATCH {result}"
+        print(f"{name:>7} {per_page:>9.2f} {rss_text}  {match}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="*", default=[], help="saved op.gg profile pages")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.pages, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark rank refreshes against a throttling stub, with and without the rate limiter.
+
+Run from the repository root:
+    python -m benchmarks.bench_rate_limit
+"""
+import argparse
+import tempfile
+import time
+
+from benchmarks.bench_persistence import make_data_manager
+from benchmarks.stub_server import StubServer
+from src.services.http_client import HttpClient
+from src.services.op_gg_service import OpGGService
+from src.services.rank_refresher import RankRefresher
+from src.services.rate_limiter import RateLimiter
+
+def run(servers, accounts_per_server, delay, max_rate, workers, rate):
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{len(servers) * accounts_per_server} accounts, {workers} workers, "
+              f"stub allows {max_rate} req/s per process")
+        print(f"{'mode':>9} {'seconds':>9} {'requests':>9} {'429s':>6} {'ranked':>7}")
+        modes = [
+            ("none", None),
+            # The stub's limit is shared by all servers, so split it between them, with headroom
+            ("limiter", RateLimiter(rate=rate or 0.9 * max_rate / len(servers), burst=2)),
+        ]
+        for mode, limiter in modes:
+            with StubServer(delay=delay, max_rate=max_rate, retry_after=1) as stub:
+                data_manager = make_data_manager(f"{tmp}/{mode}", servers, accounts_per_server)
+                # Without the limiter, urllib3 retries 429s after Retry-After itself
+                http_client = HttpClient(rate_limiter=limiter)
+                provider = OpGGService(
+                    f"{tmp}/{mode}/http_cache",
+                    base_url=stub.base_url,
+                    http_client=http_client
+                )
+                refresher = RankRefresher(data_manager, provider, max_workers=workers)
+                start = time.perf_counter()
+                refresher.update_all_ranks()
+                elapsed = time.perf_counter() - start
+                http_client.close()
+                ranked = sum(
+                    1
+                    for server in servers
+                    for account in data_manager.get_accounts(server)
+                    if account["ranks"]["solo"]["rank"] != "Unranked"
+                )
+                print(f"{mode:>9} {elapsed:>9.2f} {stub.request_count:>9} "
+                      f"{stub.throttled_count:>6} {ranked:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", nargs="+", default=["EUW", "NA"])
+    parser.add_argument("--accounts", type=int, default=30, help="accounts per server")
+    parser.add_argument("--delay", type=float, default=0.02, help="stub latency in seconds")
+    parser.add_argument("--max-rate", type=int, default=20, help="stub requests per second before 429")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=None, help="limiter rate per region (default: 0.9 * max-rate / servers)")
+    args = parser.parse_args()
+    run(args.servers, args.accounts, args.delay, args.max_rate, args.workers, args.rate)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Time AccountsFrame.refresh_accounts against account count.
+
+Needs a display (use xvfb-run on a headless machine). Run from the
+repository root:
+    python -m benchmarks.bench_refresh_accounts
+"""
+import argparse
+import tempfile
+import time
+
+import customtkinter as ctk
+
+from src.ui.frames import AccountsFrame
+from src.utils.data_manager import DataManager
+
+SERVER = "EUW"
+
+def make_data_manager(data_dir, count):
+    data_manager = DataManager(data_dir)
+    with data_manager.batch():
+        data_manager.add_server(SERVER)
+        for i in range(count):
+            data_manager.add_account(SERVER, {
+                "name": f"Player{i}#{SERVER}",
+                "id": f"id_{i}",
+                "password": "x",
+                "usage": {"id_copies": 0, "password_copies": 0, "total_copies": i % 7}
+            })
+    return data_manager
+
+def timed(window, fn):
+    """Run fn and flush pending Tk work, returning elapsed milliseconds."""
+    start = time.perf_counter()
+    fn()
+    window.update()
+    return (time.perf_counter() - start) * 1000
+
+def rebuild(frame):
+    """The previous refresh strategy: destroy every row and build them all again."""
+    if frame.virtual_list is not None:
+        frame.virtual_list.destroy()
+        frame.virtual_list = None
+    for account_id in list(frame.accounts):
+        frame.accounts.pop(account_id).destroy()
+    frame._order = []
+    frame.refresh_accounts(SERVER)
+
+def run(counts):
+    window = ctk.CTk()
+    window.withdraw()
+    print(f"{'accounts':>9} {'first':>9} {'unchanged':>10} {'move':>9} {'sort':>9} {'rebuild':>9}  (ms)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in counts:
+            data_manager = make_data_manager(f"{tmp}/{count}", count)
+            container = ctk.CTkFrame(window)
+            frame = AccountsFrame(container, data_manager, None)
+            
+            first = timed(window, lambda: frame.refresh_accounts(SERVER))
+            unchanged = timed(window, lambda: frame.refresh_accounts(SERVER))
+            
+            data_manager.move_account(SERVER, f"id_{count - 1}", count // 2)
+            move = timed(window, lambda: frame.refresh_accounts(SERVER))
+            
+            data_manager.sort_accounts(SERVER, key=lambda a: a["usage"]["total_copies"], reverse=True)
+            sort = timed(window, lambda: frame.refresh_accounts(SERVER))
+            
+            full = timed(window, lambda: rebuild(frame))
+            print(f"{count:>9} {first:>9.1f} {unchanged:>10.1f} {move:>9.1f} {sort:>9.1f} {full:>9.1f}")
+            container.destroy()
+    window.destroy()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 50, 100, 200, 1000])
+    args = parser.parse_args()
+    run(args.counts)
+
+if __name__ == "__main__":
+    main()
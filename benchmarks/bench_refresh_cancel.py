@@ -0,0 +1,82 @@
+"""Cancel a rank refresh midway, then resume it from the checkpoint.
+
+Reports how long cancel() takes to return while slow requests are in
+flight, and how many accounts the resumed run fetches again compared with
+starting over. Uses a FixtureRankProvider with simulated latency.
+Run from the repository root:
+    python -m benchmarks.bench_refresh_cancel
+"""
+import argparse
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from benchmarks.bench_persistence import make_data_manager
+from benchmarks.fixture_pages import write_fixture_dir
+from src.services.rank_provider import FixtureRankProvider
+from src.services.rank_refresher import RankRefresher
+from src.services.refresh_job import RefreshJob
+
+SERVERS = ["EUW", "EUNE"]
+
+class CountingProvider(FixtureRankProvider):
+    """Counts fetches per account."""
+    
+    def __init__(self, fixture_dir, delay):
+        super().__init__(fixture_dir, delay)
+        self.fetches = Counter()
+        self._lock = threading.Lock()
+    
+    def fetch(self, server, account_name, cancel=None):
+        with self._lock:
+            self.fetches[(server, account_name)] += 1
+        return super().fetch(server, account_name, cancel)
+
+def run(accounts_per_server, delay, cancel_after, workers):
+    total = len(SERVERS) * accounts_per_server
+    print(f"{total} accounts, {delay * 1000:.0f} ms per request, {workers} workers, cancel after {cancel_after:.1f} s")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_manager = make_data_manager(tmp, SERVERS, accounts_per_server)
+        provider = CountingProvider(write_fixture_dir(f"{tmp}/fixtures"), delay)
+        refresher = RankRefresher(data_manager, provider, max_workers=workers, max_per_server=workers)
+        
+        job = RefreshJob(refresher, refresher.select_accounts())
+        thread = threading.Thread(target=job.run)
+        thread.start()
+        time.sleep(cancel_after)
+        start = time.perf_counter()
+        job.cancel()
+        job.wait()
+        cancel_ms = (time.perf_counter() - start) * 1000
+        thread.join()
+        first = sum(job.outcomes.values())
+        left = len(job.checkpoint.load() or [])
+        
+        resumed = RefreshJob.resume(refresher)
+        resumed.run()
+        second = sum(resumed.outcomes.values())
+        
+        print(f"  cancel returned in    {cancel_ms:>8.1f} ms")
+        print(f"  fetched before cancel {first:>8}")
+        print(f"  left in checkpoint    {left:>8}")
+        print(f"  fetched on resume     {second:>8}")
+        print(f"  fetched more than once{sum(1 for n in provider.fetches.values() if n > 1):>8} (cancelled in flight, fetched again on resume)")
+        print(f"  checkpoint cleared    {'yes' if not job.checkpoint.path.exists() else 'no':>8}")
+        missing = [
+            account["id"] for server in SERVERS for account in data_manager.get_accounts(server)
+            if account.get("ranks", {}).get("status") != "ok"
+        ]
+        print(f"  accounts without ranks{len(missing):>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=200, help="accounts per server")
+    parser.add_argument("--delay", type=float, default=0.5, help="seconds per request")
+    parser.add_argument("--cancel-after", type=float, default=3.0, help="seconds before cancelling")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    run(args.accounts, args.delay, args.cancel_after, args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Measure GUI startup: import-time breakdown and time to first frame.
+
+Each measurement runs in a fresh interpreter. Reports the slowest
+top-level imports of src.app (from python -X importtime), whether the
+scraping stack was loaded at startup, the time until the window is first
+painted, and the time until the accounts are shown.
+
+Needs a display (use xvfb-run on a headless machine). Run from the
+repository root:
+    python -m benchmarks.bench_startup
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.bench_persistence import make_data_manager
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that should only load once "Get Ranks" is used
+SCRAPING_MODULES = ("requests", "urllib3", "lxml", "bs4")
+
+FIRST_FRAME_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from src.app import ModernApp
+imported = time.perf_counter()
+ready = []
+app = ModernApp(data_dir=sys.argv[1], on_ready=lambda: ready.append(time.perf_counter()))
+while not app.window.winfo_viewable():
+    app.window.update()
+app.window.update_idletasks()
+first_frame = time.perf_counter()
+while not ready:
+    app.window.update()
+    time.sleep(0.001)
+app.window.update_idletasks()
+shown = time.perf_counter()
+app.window.destroy()
+print(json.dumps({
+    "import": imported - start,
+    "first_frame": first_frame - start,
+    "accounts_shown": shown - start,
+    "scraping": [name for name in %r if name in sys.modules],
+}))
+""" % (SCRAPING_MODULES,)
+
+def import_breakdown(module, top):
+    """The module's slowest direct imports by cumulative time, and its own total."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    # Imports are logged as they finish, children before their parent and
+    # indented two spaces per level under it
+    children = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            if name.strip() == module:
+                children.sort(reverse=True)
+                return children[:top], int(cumulative)
+            children = []
+        elif depth == 1:
+            children.append((int(cumulative), name.strip()))
+    raise RuntimeError(f"{module} not found in -X importtime output")
+
+def first_frame(data_dir):
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_FRAME_SCRIPT, str(data_dir)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def run(accounts, repeats, top):
+    entries, total = import_breakdown("src.app", top)
+    print(f"import src.app: {total / 1000:.1f} ms, slowest direct imports:")
+    for cumulative, name in entries:
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        make_data_manager(tmp, ["EUW"], accounts)
+        runs = [first_frame(tmp) for _ in range(repeats)]
+    
+    print(f"\n{accounts} accounts, median of {repeats} runs")
+    for key in ("import", "first_frame", "accounts_shown"):
+        print(f"  {key:<15} {statistics.median(run[key] for run in runs) * 1000:>8.1f} ms")
+    scraping = sorted({name for run in runs for name in run["scraping"]})
+    print(f"  scraping stack loaded at startup: {', '.join(scraping) or 'no'}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="number of imports to list")
+    args = parser.parse_args()
+    run(args.accounts, args.repeats, args.top)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Time single-account writes against account count, accounts.json vs. SQLite.
+
+Each write is one DataManager.update_account call outside a batch, as a
+Copy click or a single rank update would make.
+Run from the repository root:
+    python -m benchmarks.bench_storage
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+from benchmarks.bench_persistence import make_data_manager
+
+SERVERS = ["EUW", "NA"]
+
+def increment_usage(account):
+    usage = account.setdefault("usage", {"id_copies": 0, "password_copies": 0, "total_copies": 0})
+    usage["id_copies"] += 1
+    usage["total_copies"] += 1
+
+def set_rank(account):
+    account["ranks"] = {
+        "solo": {"rank": "gold 2", "lp": "45 LP"},
+        "flex": {"rank": "silver 1", "lp": "12 LP"}
+    }
+
+def time_writes(data_manager, fn, writes):
+    server = SERVERS[0]
+    accounts = data_manager.get_accounts(server)
+    samples = []
+    for i in range(writes):
+        account_id = accounts[i % len(accounts)]["id"]
+        start = time.perf_counter()
+        data_manager.update_account(server, account_id, fn)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+def run(counts, writes):
+    print(f"median ms per write over {writes} writes")
+    print(f"{'accounts':>9} {'storage':>8} {'usage +1':>9} {'rank':>8}")
+    for count in counts:
+        for storage in ("json", "sqlite"):
+            with tempfile.TemporaryDirectory() as tmp:
+                data_manager = make_data_manager(tmp, SERVERS, count // len(SERVERS), storage)
+                usage_ms = time_writes(data_manager, increment_usage, writes)
+                rank_ms = time_writes(data_manager, set_rank, writes)
+                data_manager.close()
+                print(f"{count:>9} {storage:>8} {usage_ms:>9.2f} {rank_ms:>8.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000], help="total accounts")
+    parser.add_argument("--writes", type=int, default=50)
+    args = parser.parse_args()
+    run(args.counts, args.writes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Compare load time, save time and file size of the storage formats.
+
+Uses a generated dataset with usage counters and ranks on every account.
+Run from the repository root:
+    python -m benchmarks.bench_storage_format
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from src.utils import storage as storage_module
+from src.utils.storage import JsonStorage, SqliteStorage
+
+SERVERS = ["EUW", "EUNE", "NA", "KR"]
+
+def make_accounts_data(count):
+    data = {"servers": list(SERVERS)}
+    for server in SERVERS:
+        data[server] = [
+            {
+                "name": f"{server}Player{i}#{server}",
+                "id": f"{server.lower()}_login_{i}",
+                "password": f"password-{i:06d}",
+                "usage": {"id_copies": i % 7, "password_copies": i % 5, "total_copies": i % 7 + i % 5},
+                "ranks": {
+                    "solo": {"rank": "gold 2", "lp": f"{i % 100} LP"},
+                    "flex": {"rank": "silver 1", "lp": f"{i % 80} LP"},
+                    "fetched_at": 1700000000.0 + i,
+                    "usage_at_fetch": i % 7,
+                    "status": "ok"
+                }
+            }
+            for i in range(count // len(SERVERS))
+        ]
+    return data
+
+def file_size(storage):
+    # Include SQLite's write-ahead log
+    return sum(path.stat().st_size for path in storage.path.parent.glob(storage.path.name + "*"))
+
+def measure(storage, data, repeats):
+    saves, loads = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        storage.write_all(data)
+        saves.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        storage.load()
+        loads.append(time.perf_counter() - start)
+    return statistics.median(saves) * 1000, statistics.median(loads) * 1000, file_size(storage) / 1024
+
+def run(count, repeats):
+    data = make_accounts_data(count)
+    print(f"{count} accounts, median of {repeats} runs (orjson {'installed' if storage_module.orjson else 'not installed'})")
+    print(f"{'format':>16} {'save ms':>9} {'load ms':>9} {'size KiB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        formats = [
+            ("json (indented)", lambda: JsonStorage(Path(tmp) / "json")),
+            ("compact", lambda: JsonStorage(Path(tmp) / "compact", compact=True)),
+            ("sqlite", lambda: SqliteStorage(Path(tmp) / "sqlite" / "accounts.db")),
+        ]
+        if storage_module.orjson:
+            formats.insert(2, ("compact, stdlib", lambda: JsonStorage(Path(tmp) / "stdlib", compact=True)))
+        for name, factory in formats:
+            storage = factory()
+            storage.path.parent.mkdir()
+            orjson = storage_module.orjson
+            if name == "compact, stdlib":
+                storage_module.orjson = None
+            try:
+                save_ms, load_ms, size = measure(storage, data, repeats)
+            finally:
+                storage_module.orjson = orjson
+                storage.close()
+            print(f"{name:>16} {save_ms:>9.1f} {load_ms:>9.1f} {size:>9.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    run(args.accounts, args.repeats)
+
+if __name__ == "__main__":
+    main()
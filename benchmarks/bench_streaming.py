@@ -0,0 +1,52 @@
+"""Compare streaming, early-terminating page downloads with full downloads.
+
+Serves a realistic-size profile page from a local stub server and reports
+time, bytes read and peak Python memory per refresh.
+Run from the repository root:
+    python -m benchmarks.bench_streaming
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_persistence import make_data_manager
+from benchmarks.fixture_pages import make_profile_page
+from benchmarks.stub_server import StubServer
+from src.services.http_client import HttpClient
+from src.services.op_gg_service import OpGGService
+from src.services.rank_refresher import RankRefresher
+
+def run(servers, accounts_per_server, filler_rows):
+    page = make_profile_page(filler_rows=filler_rows)
+    with StubServer(delay=0, page=page) as stub, tempfile.TemporaryDirectory() as tmp:
+        count = len(servers) * accounts_per_server
+        print(f"{count} accounts, {len(page) / 1024:.0f} KiB page")
+        print(f"{'mode':>8} {'seconds':>9} {'KiB read':>10} {'peak MiB':>9}")
+        for mode in ("full", "stream"):
+            data_manager = make_data_manager(f"{tmp}/{mode}", servers, accounts_per_server)
+            service = OpGGService(
+                f"{tmp}/{mode}/http_cache",
+                base_url=stub.base_url,
+                http_client=HttpClient(),
+                stream=mode == "stream"
+            )
+            tracemalloc.start()
+            start = time.perf_counter()
+            RankRefresher(data_manager, service).update_all_ranks()
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            read_kb = service.cache.stats()["bytes_downloaded"] / 1024
+            print(f"{mode:>8} {elapsed:>9.3f} {read_kb:>10.0f} {peak / 2**20:>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", nargs="+", default=["EUW", "EUNE", "NA"])
+    parser.add_argument("--accounts", type=int, default=20, help="accounts per server")
+    parser.add_argument("--filler-rows", type=int, default=2000, help="page size knob")
+    args = parser.parse_args()
+    run(args.servers, args.accounts, args.filler_rows)
+
+if __name__ == "__main__":
+    main()
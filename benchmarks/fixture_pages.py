@@ -0,0 +1,36 @@
+"""Synthetic op.gg-sized profile pages for offline benchmarks."""
+from pathlib import Path
+
+SECTION = """<div class="{css_class}"><div class="header">{title}</div>
+<div class="content"><div class="wrapper"><div class="info">
+<div class="tier">{tier}</div><div class="lp">{lp}</div>
+</div></div></div></div>"""
+
+FILLER_ROW = (
+    '<div class="css-match egd6cgn0"><div class="game"><span class="champion">Champion {i}</span>'
+    '<span class="kda">{i}/3/7</span><a href="/summoners/euw/Player-{i}">Player {i}</a>'
+    '<img src="//cdn.example/{i}.png" alt=""></div></div>'
+)
+
+def make_profile_page(solo=("gold 2", "45 LP"), flex=("silver 1", "12 LP"), filler_rows=2000,
+                      ranks_first=True):
+    """Build a profile page of realistic size (~0.5 MB with the default filler)."""
+    sections = []
+    if solo:
+        sections.append(SECTION.format(css_class="css-1wk31w7 egd6cgn0", title="Ranked Solo/Duo",
+                                       tier=solo[0], lp=solo[1]))
+    if flex:
+        sections.append(SECTION.format(css_class="css-1muxmfk egd6cgn0", title="Ranked Flex",
+                                       tier=flex[0], lp=flex[1]))
+    head = ("<html><head><meta charset='utf-8'><title>Profile</title>"
+            + "<script>window.__DATA__ = {};</script>" * 50 + "</head><body><div id='root'>")
+    filler = "".join(FILLER_ROW.format(i=i) for i in range(filler_rows))
+    body = "".join(sections) + filler if ranks_first else filler + "".join(sections)
+    return (head + body + "</div></body></html>").encode("utf-8")
+
+def write_fixture_dir(fixture_dir, page=None):
+    """Create a FixtureRankProvider directory whose default.html is page."""
+    fixture_dir = Path(fixture_dir)
+    fixture_dir.mkdir(parents=True, exist_ok=True)
+    (fixture_dir / "default.html").write_bytes(page if page is not None else make_profile_page())
+    return fixture_dir
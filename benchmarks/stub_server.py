@@ -0,0 +1,149 @@
+import hashlib
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from src.services.rank_provider import FixtureRankProvider
+
+# Minimal op.gg-like profile page with both ranked sections
+PROFILE_PAGE = """<html><body>
+<div class="css-1wk31w7 egd6cgn0"><div class="content"><div class="info">
+<div class="tier">gold 2</div><div class="lp">45 LP</div>
+</div></div></div>
+<div class="css-1muxmfk egd6cgn0"><div class="content"><div class="info">
+<div class="tier">silver 1</div><div class="lp">12 LP</div>
+</div></div></div>
+</body></html>"""
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    
+    def handle_error(self, request, client_address):
+        # Clients that stop reading early reset the connection; that's expected
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+class StubServer:
+    """Local HTTP server that answers every GET with a profile page after a fixed delay.
+    
+    With fixture_dir, /summoners/<server>/<name> is served from saved pages
+    via FixtureRankProvider (404 if there is no page); otherwise every
+    request gets the same page. Sends an ETag and answers matching
+    If-None-Match requests with 304. With max_rate, requests beyond that
+    many per second get a 429 with Retry-After, like op.gg's throttling.
+    """
+    
+    def __init__(self, delay=0.05, page=PROFILE_PAGE, fixture_dir=None, max_rate=None,
+                 retry_after=1):
+        self.delay = delay
+        self.max_rate = max_rate
+        self.retry_after = retry_after
+        self.throttled_count = 0
+        self._window = []
+        self.page = page if isinstance(page, bytes) else page.encode("utf-8")
+        self.fixtures = FixtureRankProvider(fixture_dir) if fixture_dir else None
+        self.request_count = 0
+        self.connection_count = 0
+        self._lock = threading.Lock()
+        
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections open so clients can reuse them
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+            
+            def do_GET(self):
+                with stub._lock:
+                    stub.request_count += 1
+                    if not getattr(self, "_counted", False):
+                        stub.connection_count += 1
+                        self._counted = True
+                if stub._over_rate():
+                    self.send_response(429)
+                    self.send_header("Retry-After", str(stub.retry_after))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                time.sleep(stub.delay)
+                
+                page = stub.page_for(self.path)
+                if page is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                
+                etag = '"' + hashlib.sha1(page).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(page)))
+                self.end_headers()
+                try:
+                    for start in range(0, len(page), 16 * 1024):
+                        self.wfile.write(page[start:start + 16 * 1024])
+                except (BrokenPipeError, ConnectionResetError):
+                    # Streaming clients hang up once they have what they need
+                    self.close_connection = True
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = _Server(("127.0.0.1", 0), Handler)
+        self._thread = None
+    
+    def _over_rate(self):
+        """Count a request against the one-second window; True if it exceeds max_rate."""
+        if not self.max_rate:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            self._window = [t for t in self._window if now - t < 1]
+            if len(self._window) >= self.max_rate:
+                self.throttled_count += 1
+                return True
+            self._window.append(now)
+            return False
+    
+    def page_for(self, path):
+        """Body for a request path, or None for 404."""
+        if not self.fixtures:
+            return self.page
+        parts = unquote(urlsplit(path).path).strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "summoners":
+            return None
+        try:
+            return self.fixtures.fetch(parts[1], parts[2])
+        except FileNotFoundError:
+            return None
+    
+    @property
+    def base_url(self):
+        """URL template compatible with OpGGService.BASE_URL."""
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/summoners/{{server}}/{{name}}"
+    
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
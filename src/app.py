@@ -1,12 +1,17 @@
+import threading
 import customtkinter as ctk
-from src.ui.frames import AccountsFrame, ServerFrame
 from src.utils.data_manager import DataManager
-from src.utils.constants import DIMENSIONS, COLORS, PADDING
+from src.utils.io_executor import init_io_executor, run_io
+from src.utils.constants import DIMENSIONS, COLORS, PADDING, FONTS, STARTUP
 
 class ModernApp:
-    """Main application class that initializes and manages the GUI."""
+    """Main application class that initializes and manages the GUI.
     
-    def __init__(self):
+    The window is shown before accounts.json is read: data loads on a
+    background thread and the account frames are built once it is ready.
+    """
+    
+    def __init__(self, data_dir=None, on_ready=None):
         # Create and configure main window
         self.window = ctk.CTk()
         self.window.title("LoL Account Manager")
@@ -16,13 +21,68 @@ class ModernApp:
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
         
-        # Initialize data manager
-        self.data_manager = DataManager()
+        # Saves, clipboard and file reads run here, off the Tk thread
+        self.io_executor = init_io_executor(self.window)
+        
+        # Set once the accounts are loaded and the frames exist
+        self.data_manager = None
+        self.server_frame = None
+        self.accounts_frame = None
+        self.on_ready = on_ready
         
         # Create main container frame
         self.main_frame = ctk.CTkFrame(self.window)
         self.main_frame.pack(pady=PADDING["DEFAULT"], padx=PADDING["DEFAULT"], fill="both", expand=True)
         
+        # Placeholder shown until the accounts are loaded
+        self.loading_label = ctk.CTkLabel(
+            self.main_frame,
+            text="Loading accounts...",
+            font=FONTS["NORMAL"]
+        )
+        self.loading_label.pack(expand=True)
+        
+        # Load accounts off the UI thread; the result is picked up by polling
+        self._load_result = {}
+        self._load_thread = threading.Thread(target=self._load_data, args=(data_dir,), daemon=True)
+        self._load_thread.start()
+        self._poll_job = self.window.after(STARTUP["POLL_MS"], self._poll_data)
+        
+        # Save logged usage before exiting
+        self.window.protocol("WM_DELETE_WINDOW", self._on_close)
+    
+    def _load_data(self, data_dir):
+        """Read accounts.json (runs on a worker thread)."""
+        try:
+            self._load_result["data_manager"] = DataManager(data_dir, backup_count=3, usage_log=True)
+        except Exception as e:
+            self._load_result["error"] = e
+    
+    def _poll_data(self):
+        """Build the UI once the background load has finished."""
+        if not self._load_result:
+            self._poll_job = self.window.after(STARTUP["POLL_MS"], self._poll_data)
+            return
+        self._poll_job = None
+        
+        if "error" in self._load_result:
+            print(f"Error loading accounts: {str(self._load_result['error'])}")
+            self.loading_label.configure(
+                text="Could not load accounts.json",
+                text_color=COLORS["BUTTON_DELETE"]
+            )
+            return
+        
+        self._build_ui(self._load_result["data_manager"])
+    
+    def _build_ui(self, data_manager):
+        """Create the server and account frames for the loaded data."""
+        # Imported here so the window can appear before the frames are loaded
+        from src.ui.frames import AccountsFrame, ServerFrame
+        
+        self.data_manager = data_manager
+        self.loading_label.destroy()
+        
         # Setup UI components
         self.server_frame = ServerFrame(self.main_frame, self.data_manager)
         self.accounts_frame = AccountsFrame(self.main_frame, self.data_manager, self.server_frame)
@@ -34,7 +94,31 @@ class ModernApp:
         
         # Load initial accounts
         self.accounts_frame.refresh_accounts(self.server_frame.get_current_server())
+        
+        # Warm the rank mapping cache before the info dialog or ordering needs it
+        run_io(lambda: self.data_manager.rank_mapping)
+        
+        if self.on_ready:
+            self.on_ready()
+    
+    def _on_close(self):
+        """Flush pending data and close the window."""
+        if self._poll_job is not None:
+            self.window.after_cancel(self._poll_job)
+            self._poll_job = None
+        # A DataManager still loading must be closed too, or its usage log is lost
+        self._load_thread.join()
+        data_manager = self.data_manager or self._load_result.get("data_manager")
+        
+        # A running rank refresh checkpoints so the next one can resume
+        if self.accounts_frame:
+            self.accounts_frame.cancel_refresh()
+        # Let queued saves finish before the final flush
+        self.io_executor.shutdown()
+        if data_manager:
+            data_manager.close()
+        self.window.destroy()
     
     def run(self):
         """Start the application main loop."""
-        self.window.mainloop() 
\ No newline at end of file
+        self.window.mainloop()
\ No newline at end of file
@@ -0,0 +1,260 @@
+"""Headless command line for rank refreshes, listing, sorting and export.
+
+Runs without a display and never imports customtkinter, so it can be
+scheduled from cron on a server while the GUI is only used as a viewer:
+    
+    python -m src.cli refresh --policy stale --concurrency 8 --json
+    python -m src.cli refresh --resume
+    python -m src.cli list --server EUW
+    python -m src.cli sort EUW --by solo
+    python -m src.cli export --format csv --output accounts.csv
+"""
+import argparse
+import csv
+import json
+import sys
+import threading
+from contextlib import redirect_stdout
+
+from src.utils.constants import REFRESH
+from src.utils.data_manager import DataManager
+
+SORT_FIELDS = ("usage", "solo", "flex", "name")
+EXPORT_FIELDS = ("server", "name", "id", "usage", "solo", "solo_lp", "flex", "flex_lp", "status", "fetched_at")
+
+class CliProgress:
+    """Progress reporter with the LoadingDialog interface, printing to stderr."""
+    
+    def __init__(self, total):
+        self.total = total
+        self.current = 0
+    
+    def update_progress(self, account_name):
+        self.current += 1
+        print(f"[{self.current}/{self.total}] {account_name}", file=sys.stderr)
+
+def _account_row(server, account):
+    """Flat, credential-free view of an account for output."""
+    ranks = account.get("ranks", {})
+    return {
+        "server": server,
+        "name": account["name"],
+        "id": account["id"],
+        "usage": account.get("usage", {}).get("total_copies", 0) // 2,
+        "solo": ranks.get("solo", {}).get("rank", "No data"),
+        "solo_lp": ranks.get("solo", {}).get("lp", ""),
+        "flex": ranks.get("flex", {}).get("rank", "No data"),
+        "flex_lp": ranks.get("flex", {}).get("lp", ""),
+        "status": ranks.get("status"),
+        "fetched_at": ranks.get("fetched_at")
+    }
+
+def _servers(data_manager, servers):
+    """The requested servers (case-insensitive), or all of them."""
+    known = data_manager.accounts_data["servers"]
+    if not servers:
+        return list(known)
+    wanted = [server.upper() for server in servers]
+    unknown = [server for server in wanted if server not in known]
+    if unknown:
+        raise SystemExit(f"Unknown server(s): {', '.join(unknown)}")
+    return wanted
+
+def _print_rows(rows, as_json):
+    if as_json:
+        json.dump(rows, sys.stdout, indent=2)
+        print()
+        return
+    for row in rows:
+        solo = f"{row['solo']} {row['solo_lp']}".strip()
+        flex = f"{row['flex']} {row['flex_lp']}".strip()
+        status = f"  [{row['status']}]" if row["status"] not in (None, "ok") else ""
+        print(f"{row['server']:<6} {row['name']:<28} solo: {solo:<20} flex: {flex:<20} usage: {row['usage']}{status}")
+
+def _policy(args, servers):
+    from src.services.refresh_policy import RefreshPolicy
+    
+    return RefreshPolicy(
+        servers=servers if args.server else None,
+        max_age_hours=args.stale_hours if args.policy == "stale" else None,
+        used_since_refresh=args.policy == "used",
+        failed_only=args.policy == "failed"
+    )
+
+def cmd_refresh(data_manager, args):
+    # Deferred so list/sort/export don't pay for the HTTP stack
+    from src.services.rank_refresher import RankRefresher
+    from src.services.refresh_job import RefreshJob
+    
+    if args.fixtures:
+        from src.services.rank_provider import FixtureRankProvider
+        provider = FixtureRankProvider(args.fixtures)
+    else:
+        from src.services.op_gg_service import OpGGService
+        provider = OpGGService(data_manager.data_dir / "http_cache")
+    
+    servers = _servers(data_manager, args.server)
+    refresher = RankRefresher(
+        data_manager,
+        provider,
+        max_workers=args.concurrency,
+        max_per_server=args.per_server
+    )
+    if args.resume:
+        job = RefreshJob.resume(refresher)
+    else:
+        job = RefreshJob(refresher, refresher.select_accounts(_policy(args, servers)))
+    items = job.items
+    
+    # Keep stdout clean for the JSON report
+    with redirect_stdout(sys.stderr if args.json else sys.stdout):
+        progress = None if args.quiet or not items else CliProgress(len(items))
+        outcomes = _run_job(job, progress) if items else {}
+    
+    if args.json:
+        refreshed = {(item["server"], item["account_id"]) for item in items}
+        rows = [
+            _account_row(server, account)
+            for server in servers
+            for account in data_manager.get_accounts(server)
+            if (server, account["id"]) in refreshed
+        ]
+        json.dump({
+            "selected": len(items),
+            "outcomes": dict(outcomes),
+            "accounts": rows,
+            "provider": refresher.provider.stats()
+        }, sys.stdout, indent=2, default=str)
+        print()
+    elif not items:
+        print("No interrupted refresh to resume" if args.resume else "No accounts to refresh")
+    
+    # Non-zero exit so schedulers notice failures and interruptions
+    return 1 if job.cancelled or sum(outcomes.values()) > outcomes.get("ok", 0) else 0
+
+def _run_job(job, progress):
+    """Run a refresh job, cancelling it on Ctrl-C so it checkpoints before exiting."""
+    threading.Thread(target=job.run, args=(progress,), daemon=True).start()
+    try:
+        # Wait in short steps so Ctrl-C is delivered promptly
+        while not job.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        print("Cancelling; resume with: refresh --resume", file=sys.stderr)
+        job.cancel()
+        job.wait()
+    return job.outcomes or {}
+
+def cmd_list(data_manager, args):
+    rows = [
+        _account_row(server, account)
+        for server in _servers(data_manager, args.server)
+        for account in data_manager.get_accounts(server)
+    ]
+    _print_rows(rows, args.json)
+    return 0
+
+def cmd_sort(data_manager, args):
+    [server] = _servers(data_manager, [args.server])
+    if args.by == "usage":
+        key = lambda account: account.get("usage", {}).get("total_copies", 0)
+    elif args.by == "name":
+        key = lambda account: account["name"].lower()
+    else:
+        rank_mapping = data_manager.rank_mapping
+        if not rank_mapping:
+            raise SystemExit("Rank mapping not available")
+        key = lambda account: rank_mapping.account_score(account, args.by)
+    # Name sorts ascending, the rest highest first like the GUI
+    data_manager.sort_accounts(server, key=key, reverse=args.by != "name")
+    
+    rows = [_account_row(server, account) for account in data_manager.get_accounts(server)]
+    _print_rows(rows, args.json)
+    return 0
+
+def cmd_export(data_manager, args):
+    rows = []
+    for server in _servers(data_manager, args.server):
+        for account in data_manager.get_accounts(server):
+            row = _account_row(server, account)
+            if args.include_credentials:
+                row["password"] = account.get("password", "")
+            rows.append(row)
+    
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump(rows, out, indent=2)
+            out.write("\n")
+        else:
+            fields = EXPORT_FIELDS + (("password",) if args.include_credentials else ())
+            writer = csv.DictWriter(out, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+    finally:
+        if args.output:
+            out.close()
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", default=None,
+                        help="directory holding accounts.json (default: the data folder next to the app, "
+                             "not the working directory)")
+    parser.add_argument("--storage", choices=("json", "compact", "sqlite"), default=None,
+                        help="storage backend (default: accounts.db if present, else accounts.json as found); "
+                             "sqlite migrates an existing accounts.json")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    refresh = subparsers.add_parser("refresh", help="fetch ranks from op.gg")
+    refresh.add_argument("--policy", choices=("all", "stale", "used", "failed"), default="all",
+                         help="which accounts to refresh (default: all)")
+    refresh.add_argument("--server", action="append", help="only this server (repeatable)")
+    refresh.add_argument("--stale-hours", type=float, default=REFRESH["STALE_HOURS"],
+                         help="age in hours for --policy stale")
+    refresh.add_argument("--concurrency", type=int, default=None, help="worker threads (default: 16)")
+    refresh.add_argument("--per-server", type=int, default=None,
+                         help="ceiling on requests in flight per server; below it the rate limiter's "
+                              "adaptive limit applies (default: 16)")
+    refresh.add_argument("--json", action="store_true", help="print a JSON report")
+    refresh.add_argument("--quiet", action="store_true", help="no per-account progress")
+    refresh.add_argument("--fixtures", help="read saved pages from this directory instead of op.gg")
+    refresh.add_argument("--resume", action="store_true",
+                         help="continue an interrupted refresh instead of selecting accounts")
+    refresh.set_defaults(func=cmd_refresh)
+    
+    list_ = subparsers.add_parser("list", help="list accounts and ranks")
+    list_.add_argument("--server", action="append", help="only this server (repeatable)")
+    list_.add_argument("--json", action="store_true", help="print JSON")
+    list_.set_defaults(func=cmd_list)
+    
+    sort = subparsers.add_parser("sort", help="reorder a server's accounts")
+    sort.add_argument("server")
+    sort.add_argument("--by", choices=SORT_FIELDS, default="solo")
+    sort.add_argument("--json", action="store_true", help="print the new order as JSON")
+    sort.set_defaults(func=cmd_sort)
+    
+    export = subparsers.add_parser("export", help="export accounts and ranks")
+    export.add_argument("--server", action="append", help="only this server (repeatable)")
+    export.add_argument("--format", choices=("json", "csv"), default="json")
+    export.add_argument("--output", help="file to write (default: stdout)")
+    export.add_argument("--include-credentials", action="store_true", help="also export passwords")
+    export.set_defaults(func=cmd_export)
+    
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # The usage log replays copies the GUI logged but has not saved yet
+    try:
+        data_manager = DataManager(args.data_dir, backup_count=3, storage=args.storage, usage_log=True)
+    except ValueError as e:
+        # Such as a migration to SQLite refused over duplicate ids
+        raise SystemExit(str(e))
+    try:
+        return args.func(data_manager, args)
+    finally:
+        data_manager.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.services.http_client import get_http_client
+from src.services.outcome import Cancelled
+
+class CachedResponse:
+    """Minimal response object returned by HttpCache.get."""
+    
+    def __init__(self, url, status_code, content, from_cache):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.from_cache = from_cache
+
+class HttpCache:
+    """On-disk HTTP response cache with TTL and ETag/Last-Modified revalidation.
+    
+    Within the TTL a cached body is returned without touching the network.
+    After it, a conditional GET is sent and a 304 reuses the stored body.
+    
+    Each entry is a <key>.json meta file naming its <key>-<n>.body file.
+    A new body gets a new name and is written before the meta that points
+    to it, so a crash never pairs a meta with another response's body.
+    Entries older than max_age seconds, and the oldest beyond max_entries,
+    are pruned once per cache instance, on the first request.
+    """
+    
+    DEFAULT_TTL = 600  # seconds
+    CHUNK_SIZE = 16 * 1024  # bytes per read when streaming
+    MAX_ENTRIES = 5000
+    MAX_AGE = 7 * 86400  # seconds
+    # Temp files older than this are left over from a crash
+    STALE_TMP_AGE = 3600
+    
+    def __init__(self, cache_dir, http_client=None, ttl=None, max_entries=None, max_age=None):
+        self.cache_dir = Path(cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.http_client = http_client or get_http_client()
+        self.ttl = self.DEFAULT_TTL if ttl is None else ttl
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self.max_age = max_age or self.MAX_AGE
+        
+        self._lock = threading.Lock()
+        # Held for the whole prune so no request stores an entry mid-scan
+        self._prune_lock = threading.Lock()
+        self._pruned = False
+        self.hits = 0          # served from disk, no request
+        self.revalidated = 0   # 304 Not Modified, body reused
+        self.misses = 0        # full download
+        self.bytes_saved = 0   # body bytes not downloaded thanks to the cache
+        self.bytes_downloaded = 0  # body bytes actually read from the network
+        self.evicted = 0       # entries removed by prune()
+    
+    def _key(self, url):
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+    
+    def _load(self, url):
+        """Return (meta, body) for url, or (None, None) if not cached."""
+        key = self._key(url)
+        try:
+            with open(self.cache_dir / f"{key}.json", 'r') as f:
+                meta = json.load(f)
+            # Entries from before bodies were versioned use <key>.body
+            with open(self.cache_dir / meta.get("body", f"{key}.body"), 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        if meta.get("url") != url:
+            return None, None
+        return meta, body
+    
+    def _write_atomic(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    def _store(self, url, meta, body=None):
+        """Write meta, and first a new body file for it if body is given."""
+        key = self._key(url)
+        old_body = None
+        if body is not None:
+            old_body = meta.get("body")
+            meta = dict(meta, body=f"{key}-{time.time_ns()}.body")
+            self._write_atomic(self.cache_dir / meta["body"], body)
+        self._write_atomic(self.cache_dir / f"{key}.json", json.dumps(meta).encode("utf-8"))
+        if old_body and old_body != meta["body"]:
+            (self.cache_dir / old_body).unlink(missing_ok=True)
+    
+    def _count(self, counter, saved=0):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            self.bytes_saved += saved
+    
+    def get(self, url, consume=None, limit_key=None, cancel=None):
+        """GET url through the cache, raising for HTTP error statuses.
+        
+        With consume, the body is streamed: each chunk is passed to
+        consume(chunk), and the download stops as soon as it returns True.
+        limit_key is passed on to the HTTP client's rate limiter.
+        Only the bytes read are cached. That prefix is served again only to
+        streaming callers, which stop at the same point.
+        
+        With a cancel Event the body is read in chunks too, and Cancelled
+        is raised between chunks once it is set; nothing is cached then.
+        """
+        if not self._pruned:
+            self.prune()
+        
+        meta, body = self._load(url)
+        if meta and meta.get("partial") and consume is None:
+            meta, body = None, None
+        now = time.time()
+        
+        if meta and now - meta["stored_at"] < self.ttl:
+            self._count("hits", len(body))
+            return self._replay(url, body, consume)
+        
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        
+        response = self.http_client.get(
+            url, headers=headers, stream=consume is not None or cancel is not None,
+            limit_key=limit_key, cancel=cancel
+        )
+        try:
+            if response.status_code == 304 and meta:
+                self._count("revalidated", len(body))
+                meta["stored_at"] = now
+                self._store(url, meta)
+                return self._replay(url, body, consume)
+            
+            response.raise_for_status()
+            content, partial = self._read(response, consume, cancel)
+        finally:
+            # Closing a partially read response drops the connection
+            response.close()
+        
+        self._count("misses")
+        with self._lock:
+            self.bytes_downloaded += len(content)
+        
+        if response.headers.get("ETag") or response.headers.get("Last-Modified") or self.ttl:
+            self._store(url, {
+                "url": url,
+                "stored_at": now,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "partial": partial,
+                # Replaced by _store, which removes the previous body
+                "body": meta.get("body") if meta else None
+            }, content)
+        return CachedResponse(url, response.status_code, content, False)
+    
+    def _read(self, response, consume, cancel=None):
+        """Read the body, stopping early if consume asks to. Returns (content, partial)."""
+        if consume is None and cancel is None:
+            return response.content, False
+        chunks = []
+        for chunk in response.iter_content(self.CHUNK_SIZE):
+            if cancel is not None and cancel.is_set():
+                raise Cancelled()
+            chunks.append(chunk)
+            if consume is not None and consume(chunk):
+                return b"".join(chunks), True
+        return b"".join(chunks), False
+    
+    def _replay(self, url, body, consume):
+        """Return a cached body, feeding it to consume first if streaming."""
+        if consume is not None:
+            consume(body)
+        return CachedResponse(url, 200, body, True)
+    
+    def stats(self):
+        """Counters since this cache was created."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "bytes_saved": self.bytes_saved,
+                "bytes_downloaded": self.bytes_downloaded,
+                "evicted": self.evicted
+            }
+    
+    def prune(self):
+        """Drop entries older than max_age, then the oldest beyond max_entries.
+        
+        Also removes bodies no meta points to and temp files left by a
+        crash. Returns the number of entries removed.
+        """
+        with self._prune_lock:
+            if self._pruned:
+                return 0
+            removed = self._prune()
+            self._pruned = True
+        with self._lock:
+            self.evicted += removed
+        return removed
+    
+    def _prune(self):
+        now = time.time()
+        metas = {}
+        bodies = {}
+        for path in self.cache_dir.iterdir():
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            if path.suffix == ".json":
+                metas[path.stem] = (mtime, path)
+            elif path.suffix == ".body":
+                bodies.setdefault(path.stem.split("-")[0], []).append(path)
+            elif path.suffix == ".tmp" and now - mtime > self.STALE_TMP_AGE:
+                path.unlink(missing_ok=True)
+        
+        # The meta is rewritten on every store and revalidation, so its mtime is the entry's age
+        by_age = sorted(metas.items(), key=lambda item: item[1][0], reverse=True)
+        expired = [key for position, (key, (mtime, _)) in enumerate(by_age)
+                   if position >= self.max_entries or now - mtime > self.max_age]
+        for key in expired:
+            metas.pop(key)[1].unlink(missing_ok=True)
+            for body in bodies.pop(key, []):
+                body.unlink(missing_ok=True)
+        
+        # Bodies of entries with no meta, or replaced ones a crash left behind
+        for key, paths in bodies.items():
+            current = None
+            if key in metas and len(paths) > 1:
+                try:
+                    with open(metas[key][1], 'r') as f:
+                        current = json.load(f).get("body")
+                except (OSError, ValueError):
+                    pass
+            for body in paths:
+                if key not in metas or (len(paths) > 1 and body.name != current):
+                    body.unlink(missing_ok=True)
+        return len(expired)
+    
+    def clear(self):
+        """Delete every cached entry."""
+        for path in self.cache_dir.iterdir():
+            if path.suffix in (".json", ".body"):
+                path.unlink(missing_ok=True)
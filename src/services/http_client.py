@@ -0,0 +1,103 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.services.outcome import Cancelled
+from src.services.rate_limiter import RateLimiter
+
+class HttpClient:
+    """Pooled, keep-alive HTTP client shared by all services."""
+    
+    # Connect and read timeouts in seconds
+    DEFAULT_TIMEOUT = (5, 15)
+    DEFAULT_RETRIES = 3
+    DEFAULT_BACKOFF = 0.5
+    POOL_SIZE = 16
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    THROTTLE_RETRIES = 3
+    USER_AGENT = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    )
+    
+    def __init__(self, timeout=None, retries=None, backoff_factor=None, pool_size=None,
+                 rate_limiter=None):
+        self.timeout = timeout or self.DEFAULT_TIMEOUT
+        self.rate_limiter = rate_limiter
+        
+        # With a rate limiter, 429s and Retry-After are left to it so it can back off
+        retry = Retry(
+            total=self.DEFAULT_RETRIES if retries is None else retries,
+            backoff_factor=self.DEFAULT_BACKOFF if backoff_factor is None else backoff_factor,
+            status_forcelist=[
+                status for status in self.RETRY_STATUSES
+                if not (rate_limiter and status == 429)
+            ],
+            allowed_methods=("GET", "HEAD"),
+            respect_retry_after_header=rate_limiter is None,
+            raise_on_status=False
+        )
+        pool_size = pool_size or self.POOL_SIZE
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+        
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = self.USER_AGENT
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def get(self, url, limit_key=None, cancel=None, **kwargs):
+        """Send a GET request, applying the default timeout if none is given.
+        
+        With a rate limiter, the request waits for a slot under limit_key
+        (default: the URL's host), and 429 responses are retried after the
+        limiter's backoff. Once the cancel Event is set, no further attempt
+        is made and Cancelled is raised instead.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if not self.rate_limiter:
+            if cancel is not None and cancel.is_set():
+                raise Cancelled()
+            return self.session.get(url, **kwargs)
+        
+        limit_key = limit_key or urlsplit(url).netloc
+        for attempt in range(self.THROTTLE_RETRIES + 1):
+            if cancel is not None and cancel.is_set():
+                raise Cancelled()
+            with self.rate_limiter.slot(limit_key, cancel) as limiter:
+                start = time.monotonic()
+                try:
+                    response = self.session.get(url, **kwargs)
+                except requests.RequestException:
+                    limiter.record(599, time.monotonic() - start)
+                    raise
+                limiter.record(
+                    response.status_code,
+                    time.monotonic() - start,
+                    response.headers.get("Retry-After")
+                )
+            if response.status_code != 429 or attempt == self.THROTTLE_RETRIES:
+                return response
+            response.close()
+    
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+def get_http_client():
+    """Return the process-wide HttpClient, creating it on first use."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient(rate_limiter=RateLimiter())
+        return _shared_client
@@ -1,14 +1,23 @@
-import requests
-from bs4 import BeautifulSoup
-from lxml import html
+from urllib.parse import urlsplit
 
-class OpGGService:
-    """Service for handling op.gg related operations."""
+from src.services.http_cache import HttpCache
+from src.services.http_client import get_http_client
+from src.services.rank_parser import StreamingRankParser
+from src.services.rank_provider import RankProvider
+
+class OpGGService(RankProvider):
+    """Rank provider that scrapes op.gg profile pages."""
     
+    name = "op.gg"
     BASE_URL = "https://www.op.gg/summoners/{server}/{name}"
     
-    def __init__(self, data_manager):
-        self.data_manager = data_manager
+    def __init__(self, cache_dir, base_url=None, http_client=None, cache=None, cache_ttl=None,
+                 stream=True):
+        # Stream pages and stop reading once both ranked sections are parsed
+        self.stream = stream
+        self.http_client = http_client or get_http_client()
+        self.cache = cache or HttpCache(cache_dir, self.http_client, ttl=cache_ttl)
+        self.base_url = base_url or self.BASE_URL
     
     def _format_account_name(self, name):
         """Format account name for URL (replace # with -)."""
@@ -18,132 +27,40 @@ class OpGGService:
         """Format server name for URL (lowercase)."""
         return server.lower()
     
-    def get_all_account_urls(self):
-        """Get all account URLs that will be requested."""
-        urls = []
-        
-        for server in self.data_manager.accounts_data:
-            if server != "servers":
-                formatted_server = self._format_server_name(server)
-                
-                for account in self.data_manager.accounts_data[server]:
-                    formatted_name = self._format_account_name(account["name"])
-                    url = self.BASE_URL.format(
-                        server=formatted_server,
-                        name=formatted_name
-                    )
-                    urls.append({
-                        "account_name": account["name"],
-                        "server": server,
-                        "url": url
-                    })
-        
-        return urls
+    def build_url(self, server, account_name):
+        return self.base_url.format(
+            server=self._format_server_name(server),
+            name=self._format_account_name(account_name)
+        )
+    
+    def _limit_key(self, server):
+        """Rate-limit each op.gg region separately."""
+        return f"{urlsplit(self.build_url(server, '')).netloc}/{self._format_server_name(server)}"
+    
+    def concurrency_limit(self, server):
+        """The region's adaptive (AIMD) limit from the rate limiter, if there is one."""
+        if not self.http_client.rate_limiter:
+            return None
+        return int(self.http_client.rate_limiter.for_key(self._limit_key(server)).limit)
     
-    def get_rank_info(self, url, account_data):
-        """Get rank information from op.gg URL and update account data."""
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Initialize ranks with "Unranked"
-            account_data["ranks"] = {
-                "solo": {"rank": "Unranked", "lp": ""},
-                "flex": {"rank": "Unranked", "lp": ""}
-            }
-            self.data_manager.save_accounts()  # Save initial Unranked state
-            
-            # Find Solo/Duo ranked section
-            solo_section = soup.find("div", {"class": "css-1wk31w7 egd6cgn0"})
-            if solo_section:
-                content_div = solo_section.find("div", {"class": "content"})
-                if content_div:
-                    info_div = content_div.find("div", {"class": "info"})
-                    if info_div:
-                        tier_div = info_div.find("div", {"class": "tier"})
-                        lp_div = info_div.find("div", {"class": "lp"})
-                        
-                        if tier_div and lp_div:
-                            account_data["ranks"]["solo"]["rank"] = tier_div.text.strip()
-                            account_data["ranks"]["solo"]["lp"] = lp_div.text.strip()
-                            self.data_manager.save_accounts()
-            
-            # Find Flex ranked section
-            flex_section = soup.find("div", {"class": "css-1muxmfk egd6cgn0"})
-            if flex_section:
-                content_div = flex_section.find("div", {"class": "content"})
-                if content_div:
-                    info_div = content_div.find("div", {"class": "info"})
-                    if info_div:
-                        tier_div = info_div.find("div", {"class": "tier"})
-                        lp_div = info_div.find("div", {"class": "lp"})
-                        
-                        if tier_div and lp_div:
-                            account_data["ranks"]["flex"]["rank"] = tier_div.text.strip()
-                            account_data["ranks"]["flex"]["lp"] = lp_div.text.strip()
-                            self.data_manager.save_accounts()
-            
-            return True
-            
-        except Exception as e:
-            print(f"Error fetching rank info: {str(e)}")
-            # Initialize with "Unranked" on error
-            account_data["ranks"] = {
-                "solo": {"rank": "Unranked", "lp": ""},
-                "flex": {"rank": "Unranked", "lp": ""}
-            }
-            self.data_manager.save_accounts()
-            return False
+    def fetch(self, server, account_name, cancel=None):
+        """Return the page, or with streaming the already-parsed sections."""
+        url = self.build_url(server, account_name)
+        limit_key = self._limit_key(server)
+        # Raises for HTTP error statuses
+        if self.stream:
+            parser = StreamingRankParser()
+            self.cache.get(url, consume=parser.feed, limit_key=limit_key, cancel=cancel)
+            return parser
+        return self.cache.get(url, limit_key=limit_key, cancel=cancel).content
     
-    def update_all_ranks(self, loading_dialog=None):
-        """Update ranks for all accounts."""
-        urls = self.get_all_account_urls()
-        
-        for item in urls:
-            # Find the account in the data structure
-            account_data = next(
-                acc for acc in self.data_manager.accounts_data[item["server"]]
-                if acc["name"] == item["account_name"]
-            )
-            
-            # Initialize ranks if not present with "No data"
-            if "ranks" not in account_data:
-                account_data["ranks"] = {
-                    "solo": {"rank": "No data", "lp": ""},
-                    "flex": {"rank": "No data", "lp": ""}
-                }
-                # Save the initialization
-                self.data_manager.save_accounts()
-            
-            # Update ranks
-            self.get_rank_info(item["url"], account_data)
-            
-            # Update loading dialog if provided
-            if loading_dialog:
-                loading_dialog.update_progress(item["account_name"])
+    def parse(self, raw):
+        if isinstance(raw, StreamingRankParser):
+            return raw.close()
+        return super().parse(raw)
     
-    def print_urls(self):
-        """Print all URLs that will be requested."""
-        urls = self.get_all_account_urls()
-        print("\nFetching ranks for all accounts:")
-        print("-" * 50)
-        for item in urls:
-            print(f"Account: {item['account_name']}")
-            print(f"Server: {item['server']}")
-            print(f"URL: {item['url']}")
-            
-            # Find the account data
-            account_data = next(
-                acc for acc in self.data_manager.accounts_data[item["server"]]
-                if acc["name"] == item["account_name"]
-            )
-            
-            # Get and print rank info
-            success = self.get_rank_info(item['url'], account_data)
-            if success:
-                print("\nRank Information:")
-                print(f"Solo/Duo: {account_data['ranks']['solo']['rank']} {account_data['ranks']['solo']['lp']}")
-                print(f"Flex: {account_data['ranks']['flex']['rank']} {account_data['ranks']['flex']['lp']}")
-            print("-" * 50) 
\ No newline at end of file
+    def stats(self):
+        stats = self.cache.stats()
+        if self.http_client.rate_limiter:
+            stats["limits"] = self.http_client.rate_limiter.stats()
+        return stats
@@ -0,0 +1,17 @@
+class Outcome:
+    """Result of fetching one account's ranks."""
+    
+    OK = "ok"
+    NOT_FOUND = "not_found"
+    PARSE_ERROR = "parse_error"
+    NETWORK_ERROR = "network_error"
+    THROTTLED = "throttled"
+    # Stopped by the refresh's cancel Event; never stored on the account
+    CANCELLED = "cancelled"
+    
+    # Outcomes a "retry failed" refresh picks up again
+    FAILED = (NOT_FOUND, PARSE_ERROR, NETWORK_ERROR, THROTTLED)
+
+class Cancelled(Exception):
+    """Raised inside a fetch once its cancel Event is set."""
+
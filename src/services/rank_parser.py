@@ -0,0 +1,99 @@
+from lxml import etree, html
+
+# Hashed op.gg class names of the ranked sections
+SOLO_SECTION_CLASS = "css-1wk31w7 egd6cgn0"
+FLEX_SECTION_CLASS = "css-1muxmfk egd6cgn0"
+
+def _has_class(name):
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+_SECTION_QUEUES = {SOLO_SECTION_CLASS: "solo", FLEX_SECTION_CLASS: "flex"}
+
+class RankParseError(Exception):
+    """A page could not be parsed while it was being streamed."""
+
+# Selectors are compiled once at import and reused for every page
+_SECTION = etree.XPath("//div[normalize-space(@class)=$css_class][1]")
+_INFO = etree.XPath(f".//div[{_has_class('content')}]//div[{_has_class('info')}]")
+_TIER = etree.XPath(f".//div[{_has_class('tier')}]")
+_LP = etree.XPath(f".//div[{_has_class('lp')}]")
+
+def _text(element):
+    """Stripped text content; works for both lxml.html and plain etree elements."""
+    return "".join(element.itertext()).strip()
+
+def _first(xpath, node, **variables):
+    result = xpath(node, **variables)
+    return result[0] if result else None
+
+def parse_section(root, css_class):
+    """Extract (tier, lp) text from a ranked section, or None if it is missing."""
+    section = _first(_SECTION, root, css_class=css_class)
+    if section is None:
+        return None
+    return _parse_section_element(section)
+
+def _parse_section_element(section):
+    """Extract (tier, lp) text from a ranked section element, or None."""
+    info = _first(_INFO, section)
+    if info is None:
+        return None
+    tier = _first(_TIER, info)
+    lp = _first(_LP, info)
+    if tier is None or lp is None:
+        return None
+    return _text(tier), _text(lp)
+
+def parse_ranks(content):
+    """Parse an op.gg profile page into {"solo": (tier, lp) | None, "flex": ...}."""
+    root = html.fromstring(content)
+    return {
+        "solo": parse_section(root, SOLO_SECTION_CLASS),
+        "flex": parse_section(root, FLEX_SECTION_CLASS)
+    }
+
+class StreamingRankParser:
+    """Incremental parser that reports when both ranked sections have been seen.
+    
+    Feed it response chunks; once feed() returns True the rest of the page
+    is not needed and the download can be abandoned.
+    """
+    
+    def __init__(self):
+        self._parser = etree.HTMLPullParser(events=("end",), tag="div")
+        self._result = {"solo": None, "flex": None}
+        self._seen = set()
+        self._closed = False
+    
+    @property
+    def done(self):
+        return len(self._seen) == len(_SECTION_QUEUES)
+    
+    def _drain(self):
+        for _, element in self._parser.read_events():
+            queue = _SECTION_QUEUES.get(" ".join((element.get("class") or "").split()))
+            # Only the first section of each kind counts, as in parse_ranks
+            if queue and queue not in self._seen:
+                self._seen.add(queue)
+                self._result[queue] = _parse_section_element(element)
+    
+    def feed(self, chunk):
+        """Parse another chunk of the page; returns True once parsing can stop.
+        
+        Raises RankParseError, so a failure during the download is not
+        mistaken for a network error.
+        """
+        try:
+            self._parser.feed(chunk)
+            self._drain()
+        except Exception as e:
+            raise RankParseError(str(e)) from e
+        return self.done
+    
+    def close(self):
+        """Finish parsing and return the same shape as parse_ranks."""
+        if not self.done and not self._closed:
+            self._closed = True
+            self._parser.close()
+            self._drain()
+        return self._result
@@ -0,0 +1,122 @@
+import time
+from pathlib import Path
+
+import requests
+
+from src.services.outcome import Cancelled, Outcome
+from src.services.rank_parser import RankParseError, parse_ranks
+from src.utils.rank_mapping import RankMapping
+
+def empty_ranks(rank="Unranked"):
+    """Build a ranks dict with both queues set to the given rank."""
+    return {
+        "solo": {"rank": rank, "lp": ""},
+        "flex": {"rank": rank, "lp": ""}
+    }
+
+class RankProvider:
+    """Source of rank data for an account.
+    
+    Subclasses implement fetch(); parse() and normalise() turn its raw
+    result into the ranks dict stored on accounts. get_ranks() runs the
+    whole pipeline and must be safe to call from worker threads.
+    """
+    
+    name = "provider"
+    
+    def build_url(self, server, account_name):
+        """Location the account's data is fetched from, for display."""
+        return None
+    
+    def fetch(self, server, account_name, cancel=None):
+        """Return the raw page for the account; raise on failure.
+        
+        Should raise Cancelled soon after the cancel Event is set.
+        """
+        raise NotImplementedError
+    
+    def parse(self, raw):
+        """Turn a raw page into {"solo": (tier, lp) | None, "flex": ...}."""
+        return parse_ranks(raw)
+    
+    def normalise(self, parsed):
+        """Turn parsed output into a ranks dict; missing queues are "Unranked"."""
+        ranks = empty_ranks()
+        for queue in ("solo", "flex"):
+            if parsed[queue]:
+                tier, lp = parsed[queue]
+                ranks[queue]["rank"] = RankMapping.normalise(tier)
+                ranks[queue]["lp"] = lp
+        return ranks
+    
+    def concurrency_limit(self, server):
+        """Requests the source currently takes in flight for server, or None for no limit."""
+        return None
+    
+    def classify_fetch_error(self, error):
+        """Map an exception raised by fetch() to an Outcome."""
+        # Streaming providers parse while fetching
+        if isinstance(error, RankParseError):
+            return Outcome.PARSE_ERROR
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            if error.response.status_code == 404:
+                return Outcome.NOT_FOUND
+            if error.response.status_code == 429:
+                return Outcome.THROTTLED
+        if isinstance(error, FileNotFoundError):
+            return Outcome.NOT_FOUND
+        return Outcome.NETWORK_ERROR
+    
+    def get_ranks(self, server, account_name, cancel=None):
+        """Fetch, parse and normalise. Returns a (ranks, outcome) tuple.
+        
+        ranks is None unless outcome is Outcome.OK, so callers can keep the
+        ranks they already have. A fetch stopped by the cancel Event returns
+        Outcome.CANCELLED.
+        """
+        try:
+            raw = self.fetch(server, account_name, cancel)
+        except Cancelled:
+            return None, Outcome.CANCELLED
+        except Exception as e:
+            outcome = self.classify_fetch_error(e)
+            print(f"Error fetching rank info for {account_name} ({outcome}): {str(e)}")
+            return None, outcome
+        try:
+            return self.normalise(self.parse(raw)), Outcome.OK
+        except Exception as e:
+            print(f"Error parsing rank info for {account_name}: {str(e)}")
+            return None, Outcome.PARSE_ERROR
+    
+    def stats(self):
+        """Provider-specific counters to report after a refresh."""
+        return {}
+
+class FixtureRankProvider(RankProvider):
+    """Serves saved profile pages from disk, for offline runs and benchmarks.
+    
+    Looks for <fixture_dir>/<server>/<name>.html (server lowercased, '#'
+    replaced with '-'), then falls back to <fixture_dir>/default.html.
+    """
+    
+    name = "fixtures"
+    
+    def __init__(self, fixture_dir, delay=0):
+        self.fixture_dir = Path(fixture_dir)
+        # Simulated per-request latency in seconds
+        self.delay = delay
+    
+    def build_url(self, server, account_name):
+        return str(self.fixture_dir / server.lower() / f"{account_name.replace('#', '-')}.html")
+    
+    def fetch(self, server, account_name, cancel=None):
+        if self.delay:
+            if cancel is None:
+                time.sleep(self.delay)
+            elif cancel.wait(self.delay):
+                raise Cancelled()
+        path = Path(self.build_url(server, account_name))
+        if not path.exists():
+            path = self.fixture_dir / "default.html"
+        with open(path, 'rb') as f:
+            return f.read()
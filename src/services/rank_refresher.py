@@ -0,0 +1,197 @@
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from src.services.rank_provider import Outcome, empty_ranks
+from src.utils.constants import REFRESH
+
+class RankRefresher:
+    """Refreshes stored account ranks from a RankProvider."""
+    
+    # Concurrency ceilings for update_ranks. Within them, a provider with a
+    # rate limiter sets the per-server limit (see concurrency_limit()), so
+    # they match the limiter's maximum to leave room for its increases.
+    MAX_WORKERS = 16
+    MAX_PER_SERVER = 16
+    # How often a running refresh checks whether it was cancelled
+    CANCEL_POLL_SECONDS = 0.1
+    
+    def __init__(self, data_manager, provider, max_workers=None, max_per_server=None):
+        self.data_manager = data_manager
+        self.provider = provider
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self.max_per_server = max_per_server or self.MAX_PER_SERVER
+    
+    def select_accounts(self, policy=None):
+        """Work items for every account, optionally filtered by a RefreshPolicy.
+        
+        Items also hold the account record, so results reach the right one
+        among accounts sharing an id; checkpoints keep only the id.
+        """
+        items = []
+        now = time.time()
+        
+        for server in list(self.data_manager.accounts_data["servers"]):
+            for account in self.data_manager.get_accounts(server):
+                if policy and not policy.selects(server, account, now):
+                    continue
+                items.append({
+                    "account_name": account["name"],
+                    "account_id": account["id"],
+                    "server": server,
+                    "account": account
+                })
+        
+        return items
+    
+    def _store_ranks(self, server, account_id, ranks, outcome=Outcome.OK):
+        """Write a fetch result into the account record through the data manager.
+        
+        On success, also records when the ranks were fetched and the usage
+        count at that time, which RefreshPolicy uses to pick stale or
+        recently used accounts. On failure the previous ranks are kept and
+        only the status is updated, so a retry can pick the account up.
+        """
+        def apply(account):
+            now = time.time()
+            if outcome == Outcome.OK:
+                ranks["fetched_at"] = now
+                ranks["usage_at_fetch"] = account.get("usage", {}).get("total_copies", 0)
+                ranks["status"] = outcome
+                account["ranks"] = ranks
+            else:
+                previous = account.setdefault("ranks", empty_ranks("No data"))
+                previous["status"] = outcome
+                previous["failed_at"] = now
+        self.data_manager.update_account(server, account_id, apply)
+    
+    def _server_cap(self, server):
+        """Requests to keep in flight for server: the provider's current limit, up to max_per_server."""
+        limit = self.provider.concurrency_limit(server)
+        return min(self.max_per_server, limit) if limit else self.max_per_server
+    
+    def _init_ranks(self, server, account_id):
+        """Initialize ranks with "No data" if the account has none yet."""
+        def apply(account):
+            account.setdefault("ranks", empty_ranks("No data"))
+        self.data_manager.update_account(server, account_id, apply)
+    
+    def update_all_ranks(self, loading_dialog=None, policy=None):
+        """Update ranks for all accounts selected by policy (default: every account)."""
+        return self.update_ranks(self.select_accounts(policy), loading_dialog)
+    
+    def update_ranks(self, items, loading_dialog=None, cancel=None, checkpoint=None):
+        """Update ranks for the given work items from select_accounts.
+        
+        Requests run on a pool of up to max_workers threads. Each server
+        gets as many requests in flight as the provider's concurrency_limit()
+        currently allows, never more than max_per_server. Results are
+        written back and reported to the loading dialog from this thread.
+        All saves are batched into a single write at the end.
+        
+        Once the cancel Event is set no new requests start. Requests still
+        in flight are passed the Event and stop reading at their next chunk
+        (or rate-limiter wait) without caching anything; their results are
+        dropped. With a RefreshCheckpoint, the items not fetched yet are
+        saved at the start, every REFRESH["CHECKPOINT_SECONDS"] and when
+        cancelled; it is cleared once every item is done.
+        Returns a Counter of outcomes.
+        """
+        with self.data_manager.batch():
+            outcomes, remaining = self._update_ranks(items, loading_dialog, cancel, checkpoint)
+        
+        # The batch has written the ranks, so the checkpoint can move on
+        if checkpoint:
+            if remaining:
+                checkpoint.save(remaining)
+            else:
+                checkpoint.clear()
+        if remaining:
+            print(f"Rank refresh cancelled with {len(remaining)} accounts left")
+        if outcomes:
+            print("Rank refresh: " + ", ".join(f"{key}={value}" for key, value in sorted(outcomes.items())))
+        stats = self.provider.stats()
+        if stats:
+            print(f"{self.provider.name}: " + ", ".join(f"{key}={value}" for key, value in stats.items()))
+        return outcomes
+    
+    def _update_ranks(self, items, loading_dialog, cancel=None, checkpoint=None):
+        """Fetch ranks for the given work items and write them back.
+        
+        Returns the outcomes and the items left unfetched on cancel.
+        """
+        outcomes = Counter()
+        # Queue up work per server
+        pending = {}
+        # Items not fetched yet, in order, for the checkpoint
+        remaining = {}
+        for position, item in enumerate(items):
+            # Initialize ranks if not present with "No data"
+            self._init_ranks(item["server"], item.get("account", item["account_id"]))
+            pending.setdefault(item["server"], deque()).append((position, item))
+            remaining[position] = item
+        
+        in_flight = {server: 0 for server in pending}
+        
+        if checkpoint:
+            checkpoint.save(list(remaining.values()))
+            next_checkpoint = time.monotonic() + REFRESH["CHECKPOINT_SECONDS"]
+        
+        cancelled = False
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {}
+            
+            def dispatch():
+                # Fill free worker slots, round-robin over servers under their cap
+                caps = {server: self._server_cap(server) for server in pending}
+                progress = True
+                while progress and len(futures) < self.max_workers:
+                    progress = False
+                    for server, queue in pending.items():
+                        if len(futures) >= self.max_workers:
+                            break
+                        if queue and in_flight[server] < caps[server]:
+                            position, item = queue.popleft()
+                            future = executor.submit(
+                                self.provider.get_ranks, item["server"], item["account_name"], cancel
+                            )
+                            futures[future] = (position, item)
+                            in_flight[server] += 1
+                            progress = True
+            
+            dispatch()
+            while futures:
+                done, _ = wait(futures, timeout=self.CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    position, item = futures.pop(future)
+                    in_flight[item["server"]] -= 1
+                    ranks, outcome = future.result()
+                    if outcome == Outcome.CANCELLED:
+                        # Stays in the checkpoint for the next run
+                        continue
+                    del remaining[position]
+                    
+                    # Update ranks, keeping the old ones on failure
+                    outcomes[outcome] += 1
+                    self._store_ranks(item["server"], item.get("account", item["account_id"]), ranks, outcome)
+                    
+                    # Update loading dialog if provided
+                    if loading_dialog:
+                        loading_dialog.update_progress(item["account_name"])
+                
+                if cancel is not None and cancel.is_set():
+                    cancelled = True
+                    break
+                if checkpoint and time.monotonic() >= next_checkpoint:
+                    # Ranks first, so the checkpoint never lists fewer accounts than are saved
+                    self.data_manager.flush()
+                    checkpoint.save(list(remaining.values()))
+                    next_checkpoint = time.monotonic() + REFRESH["CHECKPOINT_SECONDS"]
+                dispatch()
+        finally:
+            # Requests in flight see the cancel Event at their next chunk or
+            # limiter wait and stop on their own, so don't wait for them
+            executor.shutdown(wait=not cancelled, cancel_futures=True)
+        
+        return outcomes, list(remaining.values())
@@ -0,0 +1,177 @@
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+from src.services.outcome import Cancelled
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Classic token bucket: rate tokens per second, holding at most burst."""
+    
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0
+        self._lock = threading.Lock()
+    
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self, cancel=None):
+        """Block until a token is available, then take it.
+        
+        Raises Cancelled if the cancel Event is set while waiting.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            if cancel is None:
+                time.sleep(wait)
+            elif cancel.wait(wait):
+                raise Cancelled()
+    
+    def pause(self, seconds):
+        """Hand out no tokens for the next seconds (e.g. from Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+class HostLimiter:
+    """Rate and AIMD concurrency limit for one host/region.
+    
+    Healthy responses raise the concurrency limit additively (about +1 per
+    limit's worth of requests). 429s, 5xx and latency spikes halve it, at
+    most once per typical request time.
+    """
+    
+    SPIKE_FACTOR = 3.0       # latency above this multiple of the average is a spike
+    LATENCY_SMOOTHING = 0.2  # EWMA weight of the newest sample
+    DEFAULT_BACKOFF = 5.0    # seconds to pause on 429 without Retry-After
+    
+    def __init__(self, rate, burst, initial=4, minimum=1, maximum=16):
+        self.bucket = TokenBucket(rate, burst)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(initial)
+        self.in_flight = 0
+        self.avg_latency = None
+        self.throttled = 0
+        self._last_decrease = 0
+        self._cond = threading.Condition()
+    
+    # How often a waiting acquire() checks its cancel Event
+    CANCEL_POLL = 0.1
+    
+    def acquire(self, cancel=None):
+        """Wait for a concurrency slot and a rate token, or until cancel is set."""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                if cancel is not None and cancel.is_set():
+                    raise Cancelled()
+                self._cond.wait(self.CANCEL_POLL if cancel is not None else None)
+            self.in_flight += 1
+        try:
+            self.bucket.acquire(cancel)
+        except BaseException:
+            self.release()
+            raise
+    
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+    
+    def record(self, status_code, latency, retry_after=None):
+        """Feed back the outcome of one request."""
+        with self._cond:
+            spike = (
+                self.avg_latency is not None
+                and latency > self.avg_latency * self.SPIKE_FACTOR
+            )
+            if self.avg_latency is None:
+                self.avg_latency = latency
+            else:
+                self.avg_latency += self.LATENCY_SMOOTHING * (latency - self.avg_latency)
+            
+            if status_code == 429 or status_code >= 500 or spike:
+                if status_code == 429:
+                    self.throttled += 1
+                now = time.monotonic()
+                if now - self._last_decrease > self.avg_latency:
+                    self._last_decrease = now
+                    self.limit = max(self.minimum, self.limit / 2)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+        
+        if status_code in (429, 503):
+            delay = parse_retry_after(retry_after)
+            if delay is None and status_code == 429:
+                delay = self.DEFAULT_BACKOFF
+            if delay:
+                self.bucket.pause(delay)
+
+class RateLimiter:
+    """Registry of HostLimiters keyed by host (or host/region)."""
+    
+    DEFAULT_RATE = 5.0    # requests per second per key
+    DEFAULT_BURST = 10
+    
+    def __init__(self, rate=None, burst=None, initial=4, minimum=1, maximum=16):
+        self.rate = rate or self.DEFAULT_RATE
+        self.burst = burst or self.DEFAULT_BURST
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self._limiters = {}
+        self._lock = threading.Lock()
+    
+    def for_key(self, key):
+        with self._lock:
+            if key not in self._limiters:
+                self._limiters[key] = HostLimiter(
+                    self.rate, self.burst, self.initial, self.minimum, self.maximum
+                )
+            return self._limiters[key]
+    
+    @contextmanager
+    def slot(self, key, cancel=None):
+        """Hold a request slot for key; the yielded limiter takes record().
+        
+        Raises Cancelled if the cancel Event is set before a slot is free.
+        """
+        limiter = self.for_key(key)
+        limiter.acquire(cancel)
+        try:
+            yield limiter
+        finally:
+            limiter.release()
+    
+    def stats(self):
+        """Current concurrency limit and 429 count per key."""
+        with self._lock:
+            return {
+                key: {"limit": round(limiter.limit, 2), "throttled": limiter.throttled}
+                for key, limiter in self._limiters.items()
+            }
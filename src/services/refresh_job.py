@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+CHECKPOINT_FILE = "refresh_checkpoint.json"
+
+class RefreshCheckpoint:
+    """Accounts an unfinished rank refresh has not fetched yet.
+    
+    Stored in data/refresh_checkpoint.json. RankRefresher writes it only
+    after the ranks fetched so far are saved, so resuming from it never
+    skips an account whose result was lost.
+    """
+    
+    def __init__(self, data_dir):
+        self.path = Path(data_dir) / CHECKPOINT_FILE
+    
+    def load(self):
+        """Work items left by an interrupted refresh, or None."""
+        try:
+            with open(self.path, 'r', encoding="utf-8") as f:
+                return json.load(f)["items"] or None
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError) as e:
+            print(f"Error reading refresh checkpoint: {str(e)}")
+            return None
+    
+    def save(self, items):
+        """Atomically replace the checkpoint with the given work items."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".refresh_checkpoint.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding="utf-8") as f:
+                # Without the account records select_accounts() adds
+                json.dump({"saved_at": time.time(), "items": [
+                    {key: value for key, value in item.items() if key != "account"} for item in items
+                ]}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    def clear(self):
+        self.path.unlink(missing_ok=True)
+
+class RefreshJob:
+    """One rank refresh run over a set of work items, cancellable from any thread.
+    
+    The run checkpoints as it goes. If it is cancelled or the process dies,
+    resume() picks up the accounts that were not fetched yet.
+    """
+    
+    def __init__(self, refresher, items):
+        self.refresher = refresher
+        self.items = items
+        self.checkpoint = RefreshCheckpoint(refresher.data_manager.data_dir)
+        self.outcomes = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+    
+    @classmethod
+    def resume(cls, refresher, items=None):
+        """Job for the items in the checkpoint (or the given ones, loaded from it earlier).
+        
+        Accounts deleted since the checkpoint are dropped and renamed ones
+        are fetched under their current name.
+        """
+        if items is None:
+            items = RefreshCheckpoint(refresher.data_manager.data_dir).load() or []
+        current = []
+        for item in items:
+            account = refresher.data_manager.get_account(item["server"], item["account_id"])
+            if account:
+                current.append(dict(item, account_name=account["name"]))
+        return cls(refresher, current)
+    
+    def run(self, progress=None):
+        """Fetch ranks for the items, reporting to progress. Returns a Counter of outcomes."""
+        try:
+            self.outcomes = self.refresher.update_ranks(
+                self.items, progress, cancel=self._cancel, checkpoint=self.checkpoint
+            )
+            return self.outcomes
+        finally:
+            self._done.set()
+    
+    def cancel(self):
+        """Stop starting requests and abandon the ones in flight."""
+        self._cancel.set()
+    
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+    
+    def wait(self, timeout=None):
+        """Block until run() returns. Returns False on timeout."""
+        return self._done.wait(timeout)
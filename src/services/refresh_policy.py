@@ -0,0 +1,61 @@
+import time
+
+# Kept free of the HTTP/parsing stack so the GUI can import it cheaply
+from src.services.outcome import Outcome
+
+class RefreshPolicy:
+    """Selects which accounts a rank refresh should touch.
+    
+    Criteria are combined with AND; a policy with none selects everything.
+    """
+    
+    def __init__(self, servers=None, max_age_hours=None, used_since_refresh=False,
+                 failed_only=False):
+        self.servers = set(servers) if servers else None
+        self.max_age_hours = max_age_hours
+        self.used_since_refresh = used_since_refresh
+        self.failed_only = failed_only
+    
+    @classmethod
+    def all_accounts(cls):
+        return cls()
+    
+    @classmethod
+    def current_server(cls, server):
+        return cls(servers=[server])
+    
+    @classmethod
+    def older_than(cls, hours):
+        return cls(max_age_hours=hours)
+    
+    @classmethod
+    def used_since_last_refresh(cls):
+        return cls(used_since_refresh=True)
+    
+    @classmethod
+    def failed(cls):
+        return cls(failed_only=True)
+    
+    def selects(self, server, account, now=None):
+        """Whether the account should be refreshed."""
+        if self.servers is not None and server not in self.servers:
+            return False
+        
+        ranks = account.get("ranks", {})
+        
+        if self.max_age_hours is not None:
+            fetched_at = ranks.get("fetched_at")
+            now = time.time() if now is None else now
+            # Never-fetched accounts are always stale
+            if fetched_at is not None and now - fetched_at < self.max_age_hours * 3600:
+                return False
+        
+        if self.used_since_refresh:
+            copies = account.get("usage", {}).get("total_copies", 0)
+            if copies <= ranks.get("usage_at_fetch", 0):
+                return False
+        
+        if self.failed_only and ranks.get("status") not in Outcome.FAILED:
+            return False
+        
+        return True
@@ -4,7 +4,7 @@ import time
 from src.utils.constants import (
     DIMENSIONS, COLORS, PADDING, FONTS,
     CANCEL_BUTTON_STYLE, REGULAR_BUTTON_STYLE,
-    DELETE_BUTTON_STYLE, DARK_BUTTON_STYLE
+    DELETE_BUTTON_STYLE, DARK_BUTTON_STYLE, PROGRESS
 )
 
 class InputDialog:
@@ -145,20 +145,32 @@ class OptionsDialog:
         self.dialog.geometry(f"+{x}+{y}")
 
 class LoadingDialog:
-    """Dialog for showing loading progress."""
+    """Dialog for showing loading progress.
     
-    def __init__(self, parent, total_accounts):
+    Call update_progress() from the Tk thread, or follow() a ProgressChannel
+    that background workers report into. With on_cancel, the dialog has a
+    Cancel button instead of grabbing the window, and closing it cancels too.
+    """
+    
+    def __init__(self, parent, total_accounts, on_cancel=None):
         self.dialog = ctk.CTkToplevel(parent)
         self.dialog.title("Loading")
         self.dialog.geometry(DIMENSIONS["LOADING_DIALOG_SIZE"])
         self.dialog.transient(parent)
-        self.dialog.grab_set()
+        if not on_cancel:
+            self.dialog.grab_set()
         
         self.current_account = 0
         self.total_accounts = total_accounts
+        self.on_cancel = on_cancel
+        self._poll_job = None
         
         self._setup_ui()
         self._center_dialog(parent)
+        
+        if on_cancel:
+            self.dialog.protocol("WM_DELETE_WINDOW", self._cancel)
+            self.dialog.bind("<Escape>", lambda e: self._cancel())
     
     def _setup_ui(self):
         # Status label
@@ -173,16 +185,69 @@ class LoadingDialog:
         self.progress_bar = ctk.CTkProgressBar(self.dialog)
         self.progress_bar.pack(pady=PADDING["DEFAULT"], padx=PADDING["DEFAULT"], fill="x")
         self.progress_bar.set(0)  # Start at 0
+        
+        # Throughput and time remaining
+        self.rate_label = ctk.CTkLabel(
+            self.dialog,
+            text="",
+            font=FONTS["NORMAL"]
+        )
+        self.rate_label.pack(pady=(0, PADDING["SMALL"]))
+        
+        if self.on_cancel:
+            self.cancel_button = ctk.CTkButton(
+                self.dialog,
+                text="Cancel",
+                command=self._cancel,
+                **CANCEL_BUTTON_STYLE
+            )
+            self.cancel_button.pack(pady=(0, PADDING["SMALL"]))
+    
+    def _cancel(self):
+        """Ask the workers to stop; the dialog closes when they have."""
+        if self.cancel_button.cget("state") == "disabled":
+            return
+        self.cancel_button.configure(state="disabled", text="Cancelling...")
+        self.on_cancel()
     
     def update_progress(self, account_name):
         """Update progress bar and status text."""
-        self.current_account += 1
+        self._show_progress(self.current_account + 1, account_name)
+    
+    def _show_progress(self, done, account_name):
+        self.current_account = done
         progress = self.current_account / self.total_accounts
         self.progress_bar.set(progress)
         self.status_label.configure(
             text=f"Querying account {account_name}... [{self.current_account}/{self.total_accounts}]"
         )
     
+    def follow(self, channel, on_finished=None):
+        """Redraw from a ProgressChannel every PROGRESS["REDRAW_MS"] until it finishes.
+        
+        on_finished runs on the Tk thread once the workers call finish().
+        """
+        def poll():
+            self._poll_job = None
+            if channel.drain() and channel.done:
+                self._show_progress(channel.done, channel.last_item)
+                eta = channel.eta()
+                remaining = f", {int(eta) // 60}:{int(eta) % 60:02d} left" if eta is not None else ""
+                self.rate_label.configure(text=f"{channel.rate():.1f} accounts/s{remaining}")
+            if channel.finished:
+                if on_finished:
+                    on_finished()
+                return
+            self._poll_job = self.dialog.after(PROGRESS["REDRAW_MS"], poll)
+        
+        poll()
+    
+    def destroy(self):
+        if self._poll_job:
+            self.dialog.after_cancel(self._poll_job)
+            self._poll_job = None
+        self.dialog.destroy()
+    
     def _center_dialog(self, parent):
         self.dialog.update_idletasks()
         x = parent.winfo_x() + (parent.winfo_width() - self.dialog.winfo_width()) // 2
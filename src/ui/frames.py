@@ -5,10 +5,13 @@ from src.utils.constants import (
     DIMENSIONS, COLORS, PADDING, FONTS, 
     DROPDOWN_STYLE, REGULAR_BUTTON_STYLE, 
     ICON_BUTTON_STYLE, DARK_BUTTON_STYLE, 
-    CANCEL_BUTTON_STYLE, DELETE_BUTTON_STYLE
+    CANCEL_BUTTON_STYLE, DELETE_BUTTON_STYLE,
+    ACCOUNT_LIST, REFRESH
 )
+from src.utils.io_executor import run_io
+from src.utils.progress import ProgressChannel
 import threading
-import json
+from bisect import bisect_left, bisect_right
 
 class ServerFrame:
     def __init__(self, parent, data_manager):
@@ -116,12 +119,8 @@ class ServerFrame:
             warning_label.pack(pady=PADDING["DIALOG_TOP"])
             
             def confirm_delete():
-                # Remove server from servers list
-                self.data_manager.accounts_data["servers"].remove(current_server)
-                # Remove server's data
-                del self.data_manager.accounts_data[current_server]
-                # Save changes
-                self.data_manager.save_accounts()
+                # Remove server and its data, saving changes
+                self.data_manager.remove_server(current_server)
                 
                 # Update dropdown
                 if self.data_manager.accounts_data["servers"]:
@@ -173,12 +172,183 @@ class ServerFrame:
             
             dialog.bind("<Escape>", lambda e: dialog.destroy())
 
+def _scrollable_frame_parts(scrollable_frame):
+    """The canvas and scrollbar inside a CTkScrollableFrame.
+    
+    CTkScrollableFrame has no public accessors for them, so this is the one
+    place that reaches into its private attributes; check it when upgrading
+    customtkinter.
+    """
+    return scrollable_frame._parent_canvas, scrollable_frame._scrollbar
+
+def _unbind(widget, sequence, funcid):
+    """Remove one handler added with bind(..., add="+").
+    
+    Before Python 3.13, tkinter's unbind(sequence, funcid) drops every
+    handler for the sequence, including CTkScrollableFrame's own.
+    """
+    script = widget.bind(sequence)
+    widget.bind(sequence, "\n".join(line for line in script.split("\n") if funcid not in line))
+    widget.deletecommand(funcid)
+
+def _row_key(account):
+    """Key for an account's row: the record's identity, as legacy accounts.json files can repeat ids."""
+    return id(account)
+
+class VirtualAccountList:
+    """Windowed account list that only materialises rows in or near the viewport.
+    
+    Rows are placed at computed offsets inside a body frame sized to the
+    full list height; rows scrolled out of view are recycled from a pool.
+    """
+    
+    def __init__(self, scrollable_frame, create_widget):
+        self.scrollable_frame = scrollable_frame
+        self.create_widget = create_widget
+        self.canvas, self.scrollbar = _scrollable_frame_parts(scrollable_frame)
+        
+        self.body = ctk.CTkFrame(scrollable_frame, fg_color=COLORS["TRANSPARENT"], height=1)
+        self.body.pack(fill="x", padx=PADDING["TINY"])
+        
+        self.accounts = []
+        self.offsets = [0]      # Top of each row in pixels, plus the total height
+        self.expanded = set()   # Row keys of rows showing their credentials
+        self.visible = {}       # Row key -> widget currently placed
+        self.pool = []          # Unplaced widgets ready for reuse
+        self.row_height = None
+        self._row_height_measured = False
+        self.expanded_height = None
+        self._render_pending = False
+        self._destroyed = False
+        
+        # Re-render whenever the view scrolls or resizes
+        self.canvas.configure(yscrollcommand=self._on_yscroll)
+        # The canvas outlives this list, so destroy() removes the handler again
+        self._configure_bind = self.canvas.bind("<Configure>", lambda e: self._schedule_render(), add="+")
+    
+    def _scaling(self):
+        return self.body._get_widget_scaling()
+    
+    def set_accounts(self, accounts):
+        """Show the given accounts, reusing rows that are already on screen."""
+        self.accounts = accounts
+        self.expanded &= {_row_key(account) for account in accounts}
+        self._layout()
+        self._render()
+    
+    def _measure(self, widget):
+        """Height of a row in pixels including its vertical padding."""
+        widget.frame.update_idletasks()
+        return widget.frame.winfo_reqheight() + 2 * round(PADDING["TINY"] * self._scaling())
+    
+    def _height(self, account):
+        if _row_key(account) in self.expanded and self.expanded_height:
+            return self.expanded_height
+        return self.row_height
+    
+    def _layout(self):
+        """Recompute row offsets and resize the body to the full list height."""
+        if self.row_height is None:
+            self.row_height = round(
+                (DIMENSIONS["ACCOUNT_BUTTON_HEIGHT"] + 6 * PADDING["TINY"]) * self._scaling()
+            )
+        offsets = [0]
+        for account in self.accounts:
+            offsets.append(offsets[-1] + self._height(account))
+        self.offsets = offsets
+        self.body.configure(height=max(1, offsets[-1] / self._scaling()))
+    
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._schedule_render()
+    
+    def _schedule_render(self):
+        # Coalesce bursts of scroll events into one render per idle cycle
+        if not self._render_pending and not self._destroyed:
+            self._render_pending = True
+            self.body.after_idle(self._render)
+    
+    def _visible_range(self):
+        """Indexes [start, end) of rows to materialise."""
+        top = self.canvas.canvasy(0) - self.body.winfo_y()
+        bottom = top + max(self.canvas.winfo_height(), self.row_height)
+        overscan = ACCOUNT_LIST["OVERSCAN_ROWS"]
+        start = max(0, bisect_right(self.offsets, top) - 1 - overscan)
+        end = min(len(self.accounts), bisect_left(self.offsets, bottom) + overscan)
+        return start, end
+    
+    def _render(self):
+        self._render_pending = False
+        if self._destroyed:
+            return
+        
+        start, end = self._visible_range()
+        window = self.accounts[start:end]
+        wanted = {_row_key(account) for account in window}
+        
+        # Recycle rows that left the window
+        for key in [key for key in self.visible if key not in wanted]:
+            widget = self.visible.pop(key)
+            widget.place_forget()
+            if len(self.pool) < ACCOUNT_LIST["MAX_POOL_SIZE"]:
+                self.pool.append(widget)
+            else:
+                widget.destroy()
+        
+        remeasure = False
+        for index, account in enumerate(window, start):
+            widget = self.visible.get(_row_key(account))
+            if widget is None:
+                if self.pool:
+                    widget = self.pool.pop()
+                    widget.reset()
+                else:
+                    widget = self.create_widget(self.body, account)
+                    widget.on_toggle = lambda expanded, w=widget: self._on_toggle(w, expanded)
+                    remeasure = not self._row_height_measured
+                self.visible[_row_key(account)] = widget
+            widget.set_account_data(account)
+            widget.set_expanded(_row_key(account) in self.expanded)
+            widget.place(self.offsets[index], self._scaling())
+        
+        # Replace the estimated row height with a measured one once a row exists
+        if remeasure:
+            collapsed = next((w for w in self.visible.values() if not w.expanded), None)
+            if collapsed:
+                self._row_height_measured = True
+                self.row_height = self._measure(collapsed)
+                self._layout()
+                self._schedule_render()
+    
+    def _on_toggle(self, widget, expanded):
+        key = _row_key(widget.account_data)
+        if expanded:
+            self.expanded.add(key)
+            if self.expanded_height is None:
+                self.expanded_height = self._measure(widget)
+        else:
+            self.expanded.discard(key)
+        self._layout()
+        self._render()
+    
+    def destroy(self):
+        self._destroyed = True
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        _unbind(self.canvas, "<Configure>", self._configure_bind)
+        self.body.destroy()
+        self.visible.clear()
+        self.pool.clear()
+
 class AccountsFrame:
     def __init__(self, parent, data_manager, server_frame):
         self.parent = parent
         self.data_manager = data_manager
         self.server_frame = server_frame
-        self.accounts = {}
+        self.accounts = {}  # Row key (see _row_key()) -> account widget
+        self._order = []  # Row keys in display order
+        self.virtual_list = None  # Set while a large server is shown windowed
+        self.refresh_job = None  # Running rank refresh and its dialog
+        self.loading_dialog = None
         
         # Create scrollable frame
         self.scrollable_frame = ctk.CTkScrollableFrame(
@@ -198,7 +368,7 @@ class AccountsFrame:
         self.ranks_button = ctk.CTkButton(
             self.button_frame,
             text="Get Ranks",
-            command=self.show_loading,
+            command=self.show_refresh_dialog,
             height=DIMENSIONS["BUTTON_HEIGHT"],
             width=DIMENSIONS["BUTTON_WIDTH"],
             **REGULAR_BUTTON_STYLE
@@ -297,19 +467,30 @@ class AccountsFrame:
             }
         }
         
-        # Add account widget
-        self.add_account_widget(account_data)
-        
-        # Save to data manager
-        self.data_manager.accounts_data[current_server].append(account_data)
-        self.data_manager.save_accounts()
+        # Save to data manager and show the new row
+        try:
+            self.data_manager.add_account(current_server, account_data)
+        except ValueError as e:
+            print(f"Error adding account: {str(e)}")
+            return
+        self.refresh_accounts(current_server)
     
     def add_account_widget(self, account_data):
-        """Add a new account widget to the frame."""
+        """Add a new account widget to the end of the frame."""
+        account = self._create_account_widget(self.scrollable_frame, account_data)
+        self.accounts[_row_key(account_data)] = account
+        self._order.append(_row_key(account_data))
+        return account
+    
+    def _create_account_widget(self, parent, account_data, auto_pack=True):
+        """Build an AccountWidget wired up to the options handlers."""
         def on_options():
             """Handle account options for this account."""
             from src.ui.dialogs import OptionsDialog  # Import here to avoid circular imports
             
+            # The widget may have been rebound to a newer record since creation
+            account_data = account.account_data
+            
             def handle_rename():
                 # Get new name using input dialog
                 new_name = InputDialog(
@@ -320,12 +501,14 @@ class AccountsFrame:
                 ).show()
                 
                 if new_name:
-                    # Update account data
-                    account_data["name"] = new_name
+                    # Update account data and save changes
+                    def rename(acc):
+                        acc["name"] = new_name
+                    self.data_manager.update_account(
+                        self.data_manager.current_server, account_data, rename
+                    )
                     # Update UI
                     account.account_button.configure(text=new_name)
-                    # Save changes
-                    self.data_manager.save_accounts()
             
             def handle_move():
                 # Get target position
@@ -337,38 +520,19 @@ class AccountsFrame:
                 
                 if new_pos and new_pos.isdigit():
                     current_server = self.data_manager.current_server
-                    accounts = self.data_manager.accounts_data[current_server]
                     new_pos = int(new_pos) - 1  # Convert to 0-based index
                     
-                    if 0 <= new_pos < len(accounts):
-                        # Find current position
-                        current_pos = next(
-                            i for i, acc in enumerate(accounts)
-                            if acc["id"] == account_data["id"]
-                        )
-                        
-                        # Swap accounts
-                        accounts[current_pos], accounts[new_pos] = accounts[new_pos], accounts[current_pos]
-                        
-                        # Save changes
-                        self.data_manager.save_accounts()
-                        
+                    # Swap accounts and save changes
+                    if self.data_manager.move_account(current_server, account_data, new_pos):
                         # Refresh UI
                         self.refresh_accounts(current_server)
             
             def handle_delete():
-                # Remove from data manager
+                # Remove from data manager and save changes
                 current_server = self.data_manager.current_server
-                self.data_manager.accounts_data[current_server] = [
-                    acc for acc in self.data_manager.accounts_data[current_server] 
-                    if acc["id"] != account_data["id"]
-                ]
-                # Save changes
-                self.data_manager.save_accounts()
+                self.data_manager.delete_account(current_server, account_data)
                 # Remove from UI
-                account.destroy()
-                # Remove from accounts dict
-                self.accounts.pop(account_data["id"])
+                self.refresh_accounts(current_server)
             
             # Show options dialog with new move option
             OptionsDialog(
@@ -381,53 +545,196 @@ class AccountsFrame:
         
         # Create account widget
         account = AccountWidget(
-            self.scrollable_frame,
+            parent,
             account_data,
             on_options,
-            self.data_manager
+            self.data_manager,
+            auto_pack=auto_pack
         )
-        self.accounts[account_data["id"]] = account
+        return account
     
     def refresh_accounts(self, server):
-        """Refresh the accounts display for the given server."""
-        # Clear current accounts
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        self.accounts.clear()
+        """Refresh the accounts display for the given server.
         
+        Large servers are shown through a VirtualAccountList. Otherwise
+        existing widgets are reused per account record and only rows that were
+        added, removed, changed or moved are touched.
+        """
         # Only load accounts if a valid server is selected
+        accounts = []
         if server and server != "No servers" and server in self.data_manager.accounts_data:
-            # Load accounts for current server
-            for account in self.data_manager.accounts_data[server]:
+            accounts = self.data_manager.get_accounts(server)
+        
+        if len(accounts) >= ACCOUNT_LIST["VIRTUAL_THRESHOLD"]:
+            if self.virtual_list is None:
+                self._reconcile_rows([])
+                self.virtual_list = VirtualAccountList(
+                    self.scrollable_frame,
+                    lambda parent, account: self._create_account_widget(parent, account, auto_pack=False)
+                )
+            self.virtual_list.set_accounts(accounts)
+            return
+        
+        if self.virtual_list is not None:
+            self.virtual_list.destroy()
+            self.virtual_list = None
+        self._reconcile_rows(accounts)
+    
+    def _reconcile_rows(self, accounts):
+        """Bring the packed rows in line with accounts, reusing widgets by record."""
+        wanted = [_row_key(account) for account in accounts]
+        
+        # Remove widgets whose accounts are gone
+        wanted_keys = set(wanted)
+        for key in [key for key in self._order if key not in wanted_keys]:
+            self.accounts.pop(key).destroy()
+        self._order = [key for key in self._order if key in wanted_keys]
+        
+        # Unpack rows from the first position whose order differs
+        first_moved = next(
+            (i for i, (old, new) in enumerate(zip(self._order, wanted)) if old != new),
+            len(self._order)
+        )
+        for key in self._order[first_moved:]:
+            self.accounts[key].pack_forget()
+        
+        # Update or create rows, re-packing everything from the first moved one
+        for position, account in enumerate(accounts):
+            widget = self.accounts.get(_row_key(account))
+            if widget is None:
+                # New widgets pack themselves at the end
                 self.add_account_widget(account)
+                continue
+            widget.set_account_data(account)
+            if position >= first_moved:
+                widget.pack()
+        self._order = wanted
+    
+    def show_refresh_dialog(self):
+        """Show dialog for choosing which accounts to refresh ranks for."""
+        # Only one refresh at a time; bring the running one's dialog forward
+        if self.refresh_job:
+            self.loading_dialog.dialog.lift()
+            return
+        
+        from src.services.refresh_job import RefreshCheckpoint
+        
+        # A checkpoint left by an interrupted refresh offers a Resume option
+        checkpoint = RefreshCheckpoint(self.data_manager.data_dir)
+        run_io(checkpoint.load, on_done=self._show_refresh_dialog)
+    
+    def _show_refresh_dialog(self, resume_items):
+        """Build the Get Ranks dialog, with Resume if resume_items is set."""
+        from src.services.refresh_policy import RefreshPolicy
+        
+        dialog = ctk.CTkToplevel(self.parent)
+        dialog.title("Get Ranks")
+        dialog.geometry(DIMENSIONS["REFRESH_DIALOG_RESUME_SIZE" if resume_items else "REFRESH_DIALOG_SIZE"])
+        dialog.transient(self.parent)
+        dialog.grab_set()
+        
+        # Center dialog
+        dialog.update_idletasks()
+        x = self.parent.winfo_x() + (self.parent.winfo_width() - dialog.winfo_width()) // 2
+        y = self.parent.winfo_y() + (self.parent.winfo_height() - dialog.winfo_height()) // 2
+        dialog.geometry(f"+{x}+{y}")
+        
+        label = ctk.CTkLabel(
+            dialog,
+            text="Refresh Ranks For",
+            font=FONTS["DIALOG"]
+        )
+        label.pack(pady=PADDING["DIALOG_TOP"])
+        
+        if resume_items:
+            ctk.CTkButton(
+                dialog,
+                text=f"Resume Last Refresh ({len(resume_items)} left)",
+                command=lambda: [dialog.destroy(), self.show_loading(resume_items=resume_items)],
+                **REGULAR_BUTTON_STYLE
+            ).pack(fill="x", padx=PADDING["DEFAULT"], pady=PADDING["SMALL"])
+        
+        stale_hours = REFRESH["STALE_HOURS"]
+        options = [
+            ("All Accounts", RefreshPolicy.all_accounts()),
+            ("Current Server", RefreshPolicy.current_server(self.data_manager.current_server)),
+            (f"Older Than {stale_hours}h", RefreshPolicy.older_than(stale_hours)),
+            ("Used Since Last Refresh", RefreshPolicy.used_since_last_refresh()),
+            ("Retry Failed", RefreshPolicy.failed())
+        ]
+        
+        for text, policy in options:
+            ctk.CTkButton(
+                dialog,
+                text=text,
+                command=lambda p=policy: [dialog.destroy(), self.show_loading(p)],
+                **DARK_BUTTON_STYLE
+            ).pack(fill="x", padx=PADDING["DEFAULT"], pady=PADDING["SMALL"])
+        
+        cancel_btn = ctk.CTkButton(
+            dialog,
+            text="Cancel",
+            command=dialog.destroy,
+            **CANCEL_BUTTON_STYLE
+        )
+        cancel_btn.pack(fill="x", padx=PADDING["DEFAULT"], pady=PADDING["DIALOG_BOTTOM"])
+        
+        dialog.bind("<Escape>", lambda e: dialog.destroy())
     
-    def show_loading(self):
-        """Show loading dialog and fetch ranks."""
+    def show_loading(self, policy=None, resume_items=None):
+        """Show loading dialog and fetch ranks for the accounts selected by policy.
+        
+        resume_items continues an interrupted refresh from its checkpoint instead.
+        """
+        if self.refresh_job:
+            return
+        
         from src.services.op_gg_service import OpGGService
+        from src.services.rank_refresher import RankRefresher
+        from src.services.refresh_job import RefreshJob
         
-        # Count total accounts
-        total_accounts = sum(
-            len(accounts) for server, accounts in self.data_manager.accounts_data.items()
-            if server != "servers"
+        refresher = RankRefresher(
+            self.data_manager,
+            OpGGService(self.data_manager.data_dir / "http_cache")
         )
         
-        # Create loading dialog with total accounts
-        loading_dialog = LoadingDialog(self.parent, total_accounts)
+        # Select accounts up front so the dialog shows only that set
+        if resume_items:
+            job = RefreshJob.resume(refresher, resume_items)
+        else:
+            job = RefreshJob(refresher, refresher.select_accounts(policy))
+        if not job.items:
+            return
+        
+        # Workers report into the channel; the dialog drains it on the Tk thread
+        channel = ProgressChannel(len(job.items))
+        self.refresh_job = job
+        self.loading_dialog = LoadingDialog(self.parent, len(job.items), on_cancel=job.cancel)
         
         def fetch_ranks():
-            # Create OpGG service and update ranks
-            opgg_service = OpGGService(self.data_manager)
-            opgg_service.update_all_ranks(loading_dialog)
-            
+            try:
+                job.run(channel)
+            finally:
+                channel.finish()
+        
+        def finished():
             # Close loading dialog and refresh UI
-            self.parent.after(0, lambda: [
-                loading_dialog.dialog.destroy(),
-                self.refresh_accounts(self.data_manager.current_server)
-            ])
+            self.loading_dialog.destroy()
+            self.loading_dialog = None
+            self.refresh_job = None
+            self.refresh_accounts(self.data_manager.current_server)
+        
+        self.loading_dialog.follow(channel, on_finished=finished)
         
         # Start fetching in a separate thread
         threading.Thread(target=fetch_ranks, daemon=True).start()
     
+    def cancel_refresh(self):
+        """Stop a running rank refresh and wait until it has checkpointed."""
+        if self.refresh_job:
+            self.refresh_job.cancel()
+            self.refresh_job.wait()
+    
     def show_order_dialog(self):
         """Show dialog for ordering accounts."""
         dialog = ctk.CTkToplevel(self.parent)
@@ -452,54 +759,33 @@ class AccountsFrame:
         
         def order_by_most_played():
             current_server = self.data_manager.current_server
-            accounts = self.data_manager.accounts_data[current_server]
             # Sort by total_copies in descending order
-            accounts.sort(key=lambda x: x["usage"]["total_copies"], reverse=True)
-            self.data_manager.save_accounts()
-            self.refresh_accounts(current_server)
-            dialog.destroy()
-        
-        def order_by_soloq():
-            # Load rank mapping
-            try:
-                with open(self.data_manager.root_dir / "data" / "rank_mapping.json", 'r') as f:
-                    rank_mapping = json.load(f)
-            except Exception:
-                return
-            
-            current_server = self.data_manager.current_server
-            accounts = self.data_manager.accounts_data[current_server]
-            
-            def get_rank_value(account):
-                rank = account.get("ranks", {}).get("solo", {}).get("rank", "Unranked").lower()
-                return rank_mapping.get(rank, {}).get("value", 0)
-            
-            # Sort by rank value in descending order
-            accounts.sort(key=get_rank_value, reverse=True)
-            self.data_manager.save_accounts()
+            self.data_manager.sort_accounts(
+                current_server,
+                key=lambda x: x["usage"]["total_copies"],
+                reverse=True
+            )
             self.refresh_accounts(current_server)
             dialog.destroy()
         
-        def order_by_flex():
-            # Load rank mapping
-            try:
-                with open(self.data_manager.root_dir / "data" / "rank_mapping.json", 'r') as f:
-                    rank_mapping = json.load(f)
-            except Exception:
-                return
-            
-            current_server = self.data_manager.current_server
-            accounts = self.data_manager.accounts_data[current_server]
-            
-            def get_rank_value(account):
-                rank = account.get("ranks", {}).get("flex", {}).get("rank", "Unranked").lower()
-                return rank_mapping.get(rank, {}).get("value", 0)
+        def order_by_rank(queue):
+            def sort(rank_mapping):
+                if not rank_mapping or not dialog.winfo_exists():
+                    return
+                
+                current_server = self.data_manager.current_server
+                
+                # Sort by rank and LP in descending order
+                self.data_manager.sort_accounts(
+                    current_server,
+                    key=lambda account: rank_mapping.account_score(account, queue),
+                    reverse=True
+                )
+                self.refresh_accounts(current_server)
+                dialog.destroy()
             
-            # Sort by rank value in descending order
-            accounts.sort(key=get_rank_value, reverse=True)
-            self.data_manager.save_accounts()
-            self.refresh_accounts(current_server)
-            dialog.destroy()
+            # Shared rank mapping, read from disk on first use
+            run_io(lambda: self.data_manager.rank_mapping, on_done=sort)
         
         # Create order buttons with distinct styling
         most_played_btn = ctk.CTkButton(
@@ -513,7 +799,7 @@ class AccountsFrame:
         soloq_btn = ctk.CTkButton(
             dialog,
             text="SoloQ Rank",
-            command=order_by_soloq,
+            command=lambda: order_by_rank("solo"),
             **DARK_BUTTON_STYLE
         )
         soloq_btn.pack(fill="x", padx=PADDING["DEFAULT"], pady=PADDING["SMALL"])
@@ -521,7 +807,7 @@ class AccountsFrame:
         flex_btn = ctk.CTkButton(
             dialog,
             text="Flex Rank",
-            command=order_by_flex,
+            command=lambda: order_by_rank("flex"),
             **DARK_BUTTON_STYLE
         )
         flex_btn.pack(fill="x", padx=PADDING["DEFAULT"], pady=PADDING["SMALL"])
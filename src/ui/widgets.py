@@ -1,26 +1,37 @@
 import customtkinter as ctk
 import pyperclip
-import json
 from src.utils.constants import (
     COLORS, DIMENSIONS, PADDING, FONTS,
     REGULAR_BUTTON_STYLE, ICON_BUTTON_STYLE,
     DARK_BUTTON_STYLE, COPY_BUTTON_STYLE,
-    CANCEL_BUTTON_STYLE
+    CANCEL_BUTTON_STYLE, ACCOUNT_LIST, USAGE_LOG
 )
+from src.utils.io_executor import run_io
 
 class AccountWidget:
     """Widget for displaying account information."""
     
-    def __init__(self, parent, account_data, on_options, data_manager):
+    def __init__(self, parent, account_data, on_options, data_manager, auto_pack=True):
         self.frame = ctk.CTkFrame(parent, fg_color=COLORS["FRAME_BG"])
-        self.frame.pack(fill="x", pady=PADDING["TINY"], padx=PADDING["TINY"])
+        if auto_pack:
+            self.pack()
         
         self.account_data = account_data
         self.data_manager = data_manager
         self.credentials_frame = None
+        self.expanded = False
+        
+        # Called with the new expanded state when the credentials are toggled
+        self.on_toggle = None
+        
+        # Credentials panel is built on first expand and released after
+        # staying collapsed for a while (see set_expanded)
+        self.id_entry = None
+        self.pass_entry = None
+        self.show_pass_btn = None
+        self._release_job = None
         
         self._setup_header(on_options)
-        self._create_credentials_frame()
     
     def _setup_header(self, on_options):
         header_frame = ctk.CTkFrame(self.frame, fg_color=COLORS["TRANSPARENT"])
@@ -77,10 +88,10 @@ class AccountWidget:
         id_label.pack(side="left", padx=PADDING["LABEL_X"])
         
         # ID Entry
-        id_entry = ctk.CTkEntry(id_frame)
-        id_entry.insert(0, self.account_data["id"])
-        id_entry.configure(state="readonly")
-        id_entry.pack(side="left", fill="x", expand=True, padx=PADDING["TINY"])
+        self.id_entry = ctk.CTkEntry(id_frame)
+        self.id_entry.insert(0, self.account_data["id"])
+        self.id_entry.configure(state="readonly")
+        self.id_entry.pack(side="left", fill="x", expand=True, padx=PADDING["TINY"])
         
         # ID Copy Button
         ctk.CTkButton(
@@ -127,10 +138,37 @@ class AccountWidget:
         ).pack(side="right", padx=PADDING["TINY"])
     
     def _toggle_credentials(self):
-        if self.credentials_frame.winfo_viewable():
-            self.credentials_frame.pack_forget()
-        else:
+        self.set_expanded(not self.expanded)
+        if self.on_toggle:
+            self.on_toggle(self.expanded)
+    
+    def set_expanded(self, expanded):
+        """Show or hide the credentials panel."""
+        if expanded == self.expanded:
+            return
+        self.expanded = expanded
+        if expanded:
+            if self._release_job:
+                self.frame.after_cancel(self._release_job)
+                self._release_job = None
+            if self.credentials_frame is None:
+                self._create_credentials_frame()
             self.credentials_frame.pack(fill="x", pady=PADDING["TINY"], padx=PADDING["TINY"])
+        else:
+            self.credentials_frame.pack_forget()
+            self._release_job = self.frame.after(
+                ACCOUNT_LIST["CREDENTIALS_RELEASE_MS"], self._release_credentials
+            )
+    
+    def _release_credentials(self):
+        """Destroy the collapsed credentials panel to free its widgets."""
+        self._release_job = None
+        if self.credentials_frame is not None and not self.expanded:
+            self.credentials_frame.destroy()
+            self.credentials_frame = None
+            self.id_entry = None
+            self.pass_entry = None
+            self.show_pass_btn = None
     
     def _toggle_password(self):
         current_show = self.pass_entry.cget("show")
@@ -141,33 +179,70 @@ class AccountWidget:
             self.pass_entry.configure(show="•")
             self.show_pass_btn.configure(text="Show")
     
+    def pack(self):
+        self.frame.pack(fill="x", pady=PADDING["TINY"], padx=PADDING["TINY"])
+    
+    def pack_forget(self):
+        self.frame.pack_forget()
+    
+    def place(self, y, scaling=1):
+        """Place the row at pixel offset y inside its parent (virtual list mode)."""
+        self.frame.place(x=0, y=y / scaling + PADDING["TINY"], relwidth=1)
+    
+    def place_forget(self):
+        self.frame.place_forget()
+    
+    def reset(self):
+        """Collapse the row and mask the password, ready for reuse."""
+        self.set_expanded(False)
+        if self.pass_entry is not None and self.pass_entry.cget("show") != "•":
+            self._toggle_password()
+    
+    def set_account_data(self, account_data):
+        """Point the widget at a (possibly updated) account record, redrawing only what changed."""
+        self.account_data = account_data
+        if self.account_button.cget("text") != account_data["name"]:
+            self.account_button.configure(text=account_data["name"])
+        if self.credentials_frame is None:
+            return
+        if self.id_entry.get() != account_data["id"]:
+            self._set_entry(self.id_entry, account_data["id"])
+        if self.pass_entry.get() != account_data["password"]:
+            self._set_entry(self.pass_entry, account_data["password"])
+    
+    def _set_entry(self, entry, value):
+        """Replace the text of a readonly entry."""
+        entry.configure(state="normal")
+        entry.delete(0, "end")
+        entry.insert(0, value)
+        entry.configure(state="readonly")
+    
     def destroy(self):
+        if self._release_job:
+            self.frame.after_cancel(self._release_job)
         self.frame.destroy()
     
     def _copy_with_tracking(self, field_type, text):
         """Copy text and track usage."""
-        pyperclip.copy(text)
-        
-        # Update usage counters
-        current_server = self.data_manager.current_server
-        for account in self.data_manager.accounts_data[current_server]:
-            if account["id"] == self.account_data["id"]:
-                if "usage" not in account:
-                    account["usage"] = {
-                        "id_copies": 0,
-                        "password_copies": 0,
-                        "total_copies": 0
-                    }
-                if field_type == "id":
-                    account["usage"]["id_copies"] += 1
-                elif field_type == "password":
-                    account["usage"]["password_copies"] += 1
-                account["usage"]["total_copies"] += 1
-                self.data_manager.save_accounts()
-                break
+        # The clipboard can block (e.g. clipboard managers), so copy in the background
+        run_io(pyperclip.copy, text)
+        
+        # Update usage counters (logged and saved in the background)
+        self.data_manager.record_copy(
+            self.data_manager.current_server, self.account_data, field_type
+        )
     
     def _show_info(self):
         """Show account usage and rank information."""
+        # rank_mapping.json is read on first use, so load it in the background
+        run_io(lambda: self.data_manager.rank_mapping, on_done=self._show_info_dialog)
+    
+    def _show_info_dialog(self, rank_mapping):
+        """Build the info dialog once the rank mapping is available."""
+        # The row may have been destroyed or recycled meanwhile
+        if not self.frame.winfo_exists():
+            return
+        
         usage = self.account_data.get("usage", {
             "id_copies": 0,
             "password_copies": 0,
@@ -180,22 +255,14 @@ class AccountWidget:
             "flex": {"rank": "No data", "lp": ""}
         })
         
-        # Load rank mapping
-        rank_mapping = {}
-        try:
-            with open(self.data_manager.root_dir / "data" / "rank_mapping.json", 'r') as f:
-                rank_mapping = json.load(f)
-        except Exception:
-            pass
-        
         # Get mapped rank names if available
         solo_rank = ranks["solo"]["rank"]
         flex_rank = ranks["flex"]["rank"]
         
         if solo_rank != "No data" and solo_rank != "Unranked":
-            solo_rank = rank_mapping.get(solo_rank.lower(), {}).get("clean_name", solo_rank)
+            solo_rank = rank_mapping.clean_name(solo_rank)
         if flex_rank != "No data" and flex_rank != "Unranked":
-            flex_rank = rank_mapping.get(flex_rank.lower(), {}).get("clean_name", flex_rank)
+            flex_rank = rank_mapping.clean_name(flex_rank)
         
         dialog = ctk.CTkToplevel(self.frame)
         dialog.title("Account Info")
@@ -221,6 +288,19 @@ class AccountWidget:
         )
         usage_label.pack(pady=2)
         
+        # Recent usage from the copy log, when it is enabled
+        if self.data_manager.usage_log:
+            days = USAGE_LOG["STATS_DAYS"]
+            recent = self.data_manager.usage_log.copies(
+                self.data_manager.current_server, self.account_data["id"], days * 86400
+            )
+            recent_label = ctk.CTkLabel(
+                usage_frame,
+                text=f"Last {days} days: {recent['total'] // 2}",
+                font=FONTS["NORMAL"]
+            )
+            recent_label.pack(pady=2)
+        
         # Soloq rank info
         soloq_frame = ctk.CTkFrame(dialog, fg_color=COLORS["BUTTON_PRIMARY"])
         soloq_frame.pack(pady=PADDING["SMALL"], padx=PADDING["DEFAULT"], fill="x")
@@ -42,15 +42,49 @@ DIMENSIONS = {
     "ADD_SERVER_DIALOG_SIZE": "350x280",
     "INPUT_DIALOG_SIZE": "300x280",
     "OPTIONS_DIALOG_SIZE": "350x300",
-    "LOADING_DIALOG_SIZE": "300x150",
+    "LOADING_DIALOG_SIZE": "300x230",
     "ORDER_DIALOG_SIZE": "300x350",
-    "INFO_DIALOG_SIZE": "300x250",
+    "INFO_DIALOG_SIZE": "300x280",
+    "REFRESH_DIALOG_SIZE": "300x450",
+    "REFRESH_DIALOG_RESUME_SIZE": "300x500",
     
     # Other
     "SCROLLABLE_FRAME_HEIGHT": 300,
     "LABEL_WIDTH": 50
 }
 
+# Account list rendering
+ACCOUNT_LIST = {
+    "VIRTUAL_THRESHOLD": 200,  # Switch to the windowed list at this many accounts
+    "OVERSCAN_ROWS": 5,        # Rows materialised above/below the viewport
+    "MAX_POOL_SIZE": 40,       # Spare row widgets kept for recycling
+    "CREDENTIALS_RELEASE_MS": 60000  # Free a collapsed credentials panel after this long
+}
+
+# Rank refresh
+REFRESH = {
+    "STALE_HOURS": 24,       # "Older than" option in the Get Ranks dialog
+    "CHECKPOINT_SECONDS": 5  # How often a running refresh saves what it has left, for resuming
+}
+
+USAGE_LOG = {
+    "COMPACT_INTERVAL": 30,  # Seconds between folding logged copies into accounts data
+    "RETENTION_DAYS": 30,    # Copy events kept for time-windowed stats
+    "STATS_DAYS": 7          # Window shown in the account info dialog
+}
+
+IO = {
+    "POLL_MS": 15  # How often the Tk thread checks for finished background I/O
+}
+
+STARTUP = {
+    "POLL_MS": 20  # How often the window checks whether accounts have loaded
+}
+
+PROGRESS = {
+    "REDRAW_MS": 100  # Loading dialog redraws at most this often, however fast accounts finish
+}
+
 # Padding and margins
 PADDING = {
     "DEFAULT": 20,
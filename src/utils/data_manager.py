@@ -1,12 +1,25 @@
 import json
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 import sys
 
+from src.utils.io_executor import get_io_executor
+from src.utils.rank_mapping import load_rank_mapping
+from src.utils.storage import StorageChanges, account_parts, open_storage
+from src.utils.usage_log import UsageLog, apply_copy
+
 class DataManager:
-    """Handles all data operations for the application."""
+    """Handles all data operations for the application.
+    
+    Accounts are kept in memory in accounts_data and persisted through a
+    storage backend (see src/utils/storage.py): accounts.json by default, or
+    an SQLite database with storage="sqlite". With usage_log=True, Copy
+    clicks go through an append-only UsageLog instead of a save each.
+    """
     
-    def __init__(self):
+    def __init__(self, data_dir=None, backup_count=0, storage=None, usage_log=False):
         # Get the application directory (works for both script and exe)
         if getattr(sys, 'frozen', False):
             # Running as executable
@@ -16,31 +29,68 @@ class DataManager:
             self.root_dir = Path(__file__).parent.parent.parent
         
         # Create data directory next to the executable/script
-        self.data_dir = self.root_dir / "data"
+        self.data_dir = Path(data_dir) if data_dir else self.root_dir / "data"
         os.makedirs(self.data_dir, exist_ok=True)
         
-        self.data_file = self.data_dir / "accounts.json"
+        # Persistence backend; backup_count only applies to accounts.json
+        self.storage = open_storage(self.data_dir, storage, backup_count)
+        self.data_file = self.storage.path
+        
+        # Guards accounts_data; every mutation from any thread goes through it
+        self._lock = threading.RLock()
+        
+        # Batched write state (see batch()); batch depth is tracked per thread
+        self._batch_state = threading.local()
+        self._dirty = False
+        # A save is waiting on the I/O executor (see save_accounts())
+        self._save_queued = False
+        
+        # Serialises writers across threads
+        self._write_lock = threading.RLock()
+        self._snapshot_seq = 0
+        self._written_seq = 0
+        
+        # Changes since the last save, for backends that write per row
+        self._changes = StorageChanges()
+        # Prepared row writes not applied yet, oldest first. Leaf lock: never
+        # held while taking _lock or _write_lock
+        self._pending_writes = []
+        self._pending_lock = threading.Lock()
         
-        # Create empty accounts.json if it doesn't exist
-        if not self.data_file.exists():
+        # Create empty storage if it doesn't exist
+        if not self.storage.exists():
             self.create_empty_accounts_file()
         
         self.accounts_data = self.load_accounts()
         
+        # In-memory indexes: (server, id) -> account records, oldest first (only
+        # legacy accounts.json files hold several), and (server, name) -> record
+        self._by_id = {}
+        self._by_name = {}
+        self._rebuild_index()
+        
         # Set initial server if available
         self._current_server = (
             self.accounts_data["servers"][0] 
             if self.accounts_data["servers"] 
             else None
         )
+        
+        # Replays copies not yet in the counters, so it must come after loading
+        self.usage_log = UsageLog(self) if usage_log else None
     
     def create_empty_accounts_file(self):
-        """Create an empty accounts.json file with initial structure."""
+        """Create empty storage with the initial structure."""
         empty_data = {
             "servers": []
         }
-        with open(self.data_file, 'w') as f:
-            json.dump(empty_data, f, indent=4)
+        with self._write_lock:
+            self.storage.write_all(empty_data)
+    
+    @property
+    def rank_mapping(self):
+        """Shared, cached RankMapping loaded from data/rank_mapping.json."""
+        return load_rank_mapping(self.root_dir / "data" / "rank_mapping.json")
     
     @property
     def current_server(self):
@@ -58,22 +108,308 @@ class DataManager:
         # Convert server name to uppercase
         server_name = server_name.upper()
         
-        # Check if server exists (case-insensitive check)
-        if server_name not in [s.upper() for s in self.accounts_data["servers"]]:
+        with self._lock:
+            # Check if server exists (case-insensitive check)
+            if server_name in [s.upper() for s in self.accounts_data["servers"]]:
+                return False
             self.accounts_data["servers"].append(server_name)
             self.accounts_data[server_name] = []  # Initialize empty account list
+            self._rebuild_index(server_name)
+            self._changes.servers = True
             if not self._current_server:
                 self._current_server = server_name
+        # Saves run outside the data lock, so readers never wait on the disk
+        self.save_accounts()
+        return True
+    
+    def remove_server(self, server):
+        """Remove a server and all of its accounts."""
+        with self._lock:
+            if server not in self.accounts_data["servers"]:
+                return False
+            self.accounts_data["servers"].remove(server)
+            for account in self.accounts_data.pop(server, []):
+                self._changes.delete(server, account["id"])
+            self._changes.servers = True
+            self._rebuild_index(server)
+            if self._current_server == server:
+                servers = self.accounts_data["servers"]
+                self._current_server = servers[0] if servers else None
+        self.save_accounts()
+        return True
+    
+    def get_accounts(self, server):
+        """Return a snapshot list of the server's accounts (empty if unknown)."""
+        with self._lock:
+            return list(self.accounts_data.get(server, []))
+    
+    def _rebuild_index(self, server=None):
+        """Rebuild the lookup indexes for one server, or for all servers."""
+        with self._lock:
+            servers = [server] if server else self.accounts_data["servers"]
+            for name in servers:
+                for index in (self._by_id, self._by_name):
+                    for key in [key for key in index if key[0] == name]:
+                        del index[key]
+                for account in self.accounts_data.get(name, []):
+                    self._index_account(name, account)
+    
+    def _index_account(self, server, account):
+        self._by_id.setdefault((server, account["id"]), []).append(account)
+        self._by_name[(server, account["name"])] = account
+    
+    def _unindex_account(self, server, account, record=None):
+        """Drop the index entries for account's id and name if they point to record.
+        
+        record defaults to account; pass the old key as account when the
+        record itself was already renamed.
+        """
+        record = account if record is None else record
+        records = self._by_id.get((server, account["id"]), [])
+        for i, candidate in enumerate(records):
+            if candidate is record:
+                del records[i]
+                if not records:
+                    del self._by_id[(server, account["id"])]
+                break
+        if self._by_name.get((server, account["name"])) is record:
+            del self._by_name[(server, account["name"])]
+    
+    def _position(self, server, account):
+        """List position of an account record, matched by identity."""
+        for i, candidate in enumerate(self.accounts_data[server]):
+            if candidate is account:
+                return i
+        return None
+    
+    def _find(self, server, account):
+        """Account record for an id, or account itself if it is one of server's records.
+        
+        If several accounts share the id, the id finds the first one indexed.
+        """
+        if isinstance(account, dict):
+            records = self._by_id.get((server, account["id"]), [])
+            return account if any(candidate is account for candidate in records) else None
+        records = self._by_id.get((server, account))
+        return records[0] if records else None
+    
+    def get_account(self, server, account_id):
+        """Return the account record with the given id, or None."""
+        with self._lock:
+            return self._find(server, account_id)
+    
+    def get_account_by_name(self, server, name):
+        """Return the account record with the given name, or None."""
+        with self._lock:
+            return self._by_name.get((server, name))
+    
+    def add_account(self, server, account_data):
+        """Append an account to the server's list.
+        
+        Raises ValueError if another account on the server has its id.
+        """
+        with self._lock:
+            if (server, account_data["id"]) in self._by_id:
+                raise ValueError(f"Account id {account_data['id']} already exists on {server}")
+            self.accounts_data[server].append(account_data)
+            self._index_account(server, account_data)
+            self._changes.account(server, account_data)
+        self.save_accounts()
+    
+    def update_account(self, server, account_id, fn, save=True):
+        """Apply fn to the account record under the lock, then save.
+        
+        With save=False the change is only marked dirty and is written by
+        the next save or flush(). Returns fn's result, or None if the
+        account no longer exists. Raises ValueError if fn gave the account
+        an id another account on the server already has; the id is put back.
+        
+        Here and in the other mutators account_id may also be the account
+        record itself, which picks it out among accounts sharing an id.
+        """
+        with self._lock:
+            account = self._find(server, account_id)
+            if account is None:
+                return None
+            old_key = (account["id"], account["name"])
+            # Row-level backends only rewrite the parts fn changed
+            before = self._serialized_parts(account) if self.storage.incremental else None
+            result = fn(account)
+            # An id taken by another account is refused; the rest of fn's changes stand
+            rejected_id = None
+            if account["id"] != old_key[0] and (server, account["id"]) in self._by_id:
+                rejected_id, account["id"] = account["id"], old_key[0]
+            # Keep the indexes in step with renames or id changes
+            if (account["id"], account["name"]) != old_key:
+                self._unindex_account(server, {"id": old_key[0], "name": old_key[1]}, account)
+                self._index_account(server, account)
+            if before is not None:
+                after = self._serialized_parts(account)
+                if account["id"] != old_key[0]:
+                    self._changes.delete(server, old_key[0])
+                    self._changes.account(server, account)
+                    self._changes.order.add(server)
+                else:
+                    changed = [part for part in after if after[part] != before[part]]
+                    if changed:
+                        self._changes.account(server, account, changed)
+            if not save:
+                self._dirty = True
+        if save:
             self.save_accounts()
-            return True
-        return False
+        if rejected_id is not None:
+            raise ValueError(f"Account id {rejected_id} already exists on {server}")
+        return result
+    
+    def delete_account(self, server, account_id):
+        """Remove the account with the given id from the server."""
+        with self._lock:
+            account = self._find(server, account_id)
+            if account is None:
+                return False
+            del self.accounts_data[server][self._position(server, account)]
+            self._unindex_account(server, account)
+            self._changes.delete(server, account["id"])
+        self.save_accounts()
+        return True
+    
+    def move_account(self, server, account_id, new_pos):
+        """Swap the account with the one at new_pos (0-based)."""
+        with self._lock:
+            accounts = self.accounts_data[server]
+            account = self._find(server, account_id)
+            if account is None or not 0 <= new_pos < len(accounts):
+                return False
+            current_pos = self._position(server, account)
+            accounts[current_pos], accounts[new_pos] = accounts[new_pos], accounts[current_pos]
+            self._changes.order.add(server)
+        self.save_accounts()
+        return True
+    
+    def sort_accounts(self, server, key, reverse=False):
+        """Sort the server's accounts in place."""
+        with self._lock:
+            self.accounts_data[server].sort(key=key, reverse=reverse)
+            self._changes.order.add(server)
+        self.save_accounts()
     
     def load_accounts(self):
-        """Load accounts from JSON file."""
-        with open(self.data_file, 'r') as f:
-            return json.load(f)
+        """Load all servers and accounts from storage."""
+        return self.storage.load()
+    
+    def _serialized_parts(self, account):
+        """Account parts as JSON strings, for detecting which ones changed."""
+        return {
+            part: json.dumps(value, sort_keys=True)
+            for part, value in account_parts(account).items()
+        }
+    
+    def record_copy(self, server, account_id, field):
+        """Count a copy of the account's "id" or "password".
+        
+        With a usage log this only updates memory and queues an event;
+        otherwise the counters are saved straight away.
+        """
+        if self.usage_log:
+            self.usage_log.record(server, account_id, field)
+        else:
+            self.update_account(server, account_id, lambda account: apply_copy(account, field))
+    
+    def flush(self):
+        """Write changes made with save=False, if any."""
+        if self._dirty:
+            self._write_accounts()
     
     def save_accounts(self):
-        """Save accounts to JSON file."""
-        with open(self.data_file, 'w') as f:
-            json.dump(self.accounts_data, f, indent=4) 
\ No newline at end of file
+        """Save accounts, deferring the write inside a batch.
+        
+        In the GUI the write is queued on the I/O executor instead, so the
+        Tk thread never waits on the disk; saves made before the queued
+        write runs are coalesced into it.
+        """
+        if getattr(self._batch_state, "depth", 0):
+            self._dirty = True
+            return
+        executor = get_io_executor()
+        if executor:
+            with self._lock:
+                self._dirty = True
+                if self._save_queued:
+                    return
+                self._save_queued = True
+            try:
+                executor.submit(self._queued_save)
+                return
+            except RuntimeError:
+                # The executor shut down meanwhile (the app is closing); write here
+                with self._lock:
+                    self._save_queued = False
+        self._write_accounts()
+    
+    def _queued_save(self):
+        with self._lock:
+            self._save_queued = False
+        self.flush()
+    
+    @contextmanager
+    def batch(self):
+        """Group this thread's saves into one write when its outermost batch exits.
+        
+        Saves from other threads are not deferred.
+        """
+        self._batch_state.depth = getattr(self._batch_state, "depth", 0) + 1
+        try:
+            yield self
+        finally:
+            self._batch_state.depth -= 1
+            if not self._batch_state.depth and self._dirty:
+                self._write_accounts()
+    
+    def _write_accounts(self):
+        """Write a consistent snapshot of accounts_data to disk and clear the dirty flag."""
+        if self.storage.incremental:
+            # Snapshot the rows under the data lock, so readers never wait on the disk
+            with self._lock:
+                self._dirty = False
+                changes, self._changes = self._changes, StorageChanges()
+                statements = self.storage.prepare_changes(self.accounts_data, changes)
+                with self._pending_lock:
+                    self._pending_writes.append(statements)
+            # Whoever gets the write lock first applies every queued snapshot in
+            # order; once we hold it, ours has been applied or is still queued
+            with self._write_lock:
+                with self._pending_lock:
+                    pending, self._pending_writes = self._pending_writes, []
+                try:
+                    self.storage.apply([statement for statements in pending for statement in statements])
+                except Exception:
+                    # The transaction rolled back: queue these writes again, ahead
+                    # of newer ones, so the next save or close() retries them
+                    with self._pending_lock:
+                        self._pending_writes[:0] = pending
+                    self._dirty = True
+                    raise
+            return
+        
+        with self._lock:
+            self._dirty = False
+            self._changes = StorageChanges()
+            payload = self.storage.serialize(self.accounts_data)
+            self._snapshot_seq += 1
+            seq = self._snapshot_seq
+        
+        with self._write_lock:
+            # A newer snapshot already reached disk; don't overwrite it
+            if seq < self._written_seq:
+                return
+            self.storage.write(payload)
+            self._written_seq = seq
+    
+    def close(self):
+        """Write pending changes, compact the usage log, if any, and release the storage backend."""
+        self.flush()
+        if self.usage_log:
+            self.usage_log.close()
+        # Wait for a write in progress on another thread
+        with self._write_lock:
+            self.storage.close()
@@ -0,0 +1,107 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.constants import IO
+
+class IOExecutor:
+    """Runs blocking disk and clipboard calls off the Tk main loop.
+    
+    Tasks run one at a time on a background thread, in submission order, so
+    saves never race each other. Callbacks are handed back to the Tk thread:
+    finished tasks are queued and drained by an after() poll, which only
+    runs while callbacks are outstanding.
+    """
+    
+    def __init__(self, root, poll_ms=None):
+        self.root = root
+        self.poll_ms = poll_ms or IO["POLL_MS"]
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="io")
+        self._finished = queue.SimpleQueue()
+        # Callbacks not yet run; only touched on the Tk thread
+        self._waiting = 0
+        self._poll_job = None
+    
+    def submit(self, fn, *args, on_done=None, on_error=None):
+        """Run fn(*args) in the background and return its Future.
+        
+        on_done(result) or on_error(exception) is called on the Tk thread, so
+        only pass them from the Tk thread. Errors without on_error are printed.
+        """
+        future = self._executor.submit(fn, *args)
+        if on_done or on_error:
+            self._waiting += 1
+            future.add_done_callback(lambda f: self._finished.put((f, on_done, on_error)))
+            if self._poll_job is None:
+                self._poll_job = self.root.after(self.poll_ms, self._poll)
+        else:
+            future.add_done_callback(_print_error)
+        return future
+    
+    def _poll(self):
+        """Run the callbacks of finished tasks on the Tk thread."""
+        self._poll_job = None
+        while True:
+            try:
+                future, on_done, on_error = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            self._waiting -= 1
+            try:
+                error = future.exception()
+                if error is None:
+                    if on_done:
+                        on_done(future.result())
+                elif on_error:
+                    on_error(error)
+                else:
+                    _print_error(future)
+            except Exception as e:
+                print(f"Error in I/O callback: {str(e)}")
+        if self._waiting:
+            self._poll_job = self.root.after(self.poll_ms, self._poll)
+    
+    def shutdown(self):
+        """Finish queued tasks (such as pending saves) and stop the worker.
+        
+        Later run_io() calls and saves run inline on the calling thread.
+        """
+        global _shared_executor
+        if _shared_executor is self:
+            _shared_executor = None
+        if self._poll_job is not None:
+            self.root.after_cancel(self._poll_job)
+            self._poll_job = None
+        self._executor.shutdown(wait=True)
+
+def _print_error(future):
+    error = future.exception()
+    if error is not None:
+        print(f"Error in background I/O: {str(error)}")
+
+_shared_executor = None
+
+def init_io_executor(root):
+    """Create the process-wide IOExecutor for the Tk root window."""
+    global _shared_executor
+    _shared_executor = IOExecutor(root)
+    return _shared_executor
+
+def get_io_executor():
+    """The process-wide IOExecutor, or None outside the GUI."""
+    return _shared_executor
+
+def run_io(fn, *args, on_done=None, on_error=None):
+    """Run fn through the shared IOExecutor, or inline when there is none (CLI, benchmarks)."""
+    executor = get_io_executor()
+    if executor:
+        return executor.submit(fn, *args, on_done=on_done, on_error=on_error)
+    try:
+        result = fn(*args)
+    except Exception as e:
+        if not on_error:
+            raise
+        on_error(e)
+        return None
+    if on_done:
+        on_done(result)
+    return None
@@ -0,0 +1,56 @@
+import queue
+import time
+
+_FINISHED = object()
+
+class ProgressChannel:
+    """Progress events from worker threads, drained by the UI at its own pace.
+    
+    Workers call update_progress() (the LoadingDialog interface, so a
+    RankRefresher can report into either) and finish(). They only enqueue,
+    so it is safe from any thread. The UI thread calls drain() on a timer
+    and redraws once per drain, however many items finished in between.
+    """
+    
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.last_item = None
+        self.finished = False
+        self.started = time.monotonic()
+        self._queue = queue.SimpleQueue()
+    
+    def update_progress(self, item):
+        """Report one finished item (worker side)."""
+        self._queue.put(item)
+    
+    def finish(self):
+        """Report that the work is over, complete or not (worker side)."""
+        self._queue.put(_FINISHED)
+    
+    def drain(self):
+        """Apply queued events (UI side). Returns True if anything changed."""
+        changed = False
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                return changed
+            changed = True
+            if event is _FINISHED:
+                self.finished = True
+            else:
+                self.done += 1
+                self.last_item = event
+    
+    def rate(self):
+        """Items finished per second so far."""
+        elapsed = time.monotonic() - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+    
+    def eta(self):
+        """Estimated seconds until all items are done, or None before the first one."""
+        rate = self.rate()
+        if not rate:
+            return None
+        return (self.total - self.done) / rate
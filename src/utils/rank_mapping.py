@@ -0,0 +1,97 @@
+import json
+import re
+import threading
+
+# Tiers in ascending order; their index is the tier ordinal
+TIERS = [
+    "unranked", "iron", "bronze", "silver", "gold", "platinum",
+    "emerald", "diamond", "master", "grandmaster", "challenger"
+]
+
+# Weight of the rank value in score(); larger than any realistic LP total
+SCORE_SCALE = 10000
+
+_LP_PATTERN = re.compile(r"-?[\d,]+")
+
+class RankMapping:
+    """Precompiled view of rank_mapping.json.
+    
+    Keys are normalised once at load time so lookups are a single dict hit.
+    """
+    
+    def __init__(self, mapping=None):
+        # normalised key -> (clean_name, value, tier_ordinal, division_ordinal)
+        self._entries = {}
+        for key, entry in (mapping or {}).items():
+            norm = self.normalise(key)
+            tier, _, division = norm.partition(" ")
+            self._entries[norm] = (
+                entry.get("clean_name", key),
+                entry.get("value", 0),
+                TIERS.index(tier) if tier in TIERS else 0,
+                # Division 4 is the lowest, so it maps to ordinal 0
+                4 - int(division) if division.isdigit() else 0
+            )
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    @staticmethod
+    def normalise(rank):
+        """Lowercase and collapse whitespace, e.g. 'Gold  2' -> 'gold 2'."""
+        return " ".join((rank or "").lower().split())
+    
+    def _entry(self, rank):
+        return self._entries.get(self.normalise(rank))
+    
+    def value(self, rank):
+        """Integer rank value (0 for unknown/unranked)."""
+        entry = self._entry(rank)
+        return entry[1] if entry else 0
+    
+    def clean_name(self, rank):
+        """Display name, e.g. 'gold 2' -> 'Gold II'; unknown ranks are returned as-is."""
+        entry = self._entry(rank)
+        return entry[0] if entry else rank
+    
+    def tier_ordinal(self, rank):
+        entry = self._entry(rank)
+        return entry[2] if entry else 0
+    
+    def division_ordinal(self, rank):
+        entry = self._entry(rank)
+        return entry[3] if entry else 0
+    
+    @staticmethod
+    def parse_lp(lp):
+        """Parse an LP string such as '1,234 LP' into an int (0 if missing)."""
+        match = _LP_PATTERN.search(lp or "")
+        return int(match.group().replace(",", "")) if match else 0
+    
+    def score(self, rank, lp=""):
+        """Single sortable number combining rank value and LP."""
+        return self.value(rank) * SCORE_SCALE + self.parse_lp(lp)
+    
+    def account_score(self, account, queue):
+        """score() for an account's 'solo' or 'flex' queue."""
+        ranked = account.get("ranks", {}).get(queue, {})
+        return self.score(ranked.get("rank", "Unranked"), ranked.get("lp", ""))
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+def load_rank_mapping(path):
+    """Load and cache the RankMapping for path.
+    
+    An unreadable file gives an empty mapping, which is not cached so a
+    later call can retry.
+    """
+    key = str(path)
+    with _cache_lock:
+        if key not in _cache:
+            try:
+                with open(path, 'r') as f:
+                    _cache[key] = RankMapping(json.load(f))
+            except Exception:
+                return RankMapping()
+        return _cache[key]
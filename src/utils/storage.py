@@ -0,0 +1,435 @@
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    # Optional: much faster encoding and decoding for compact JSON
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_FILE = "accounts.json"
+SQLITE_FILE = "accounts.db"
+
+# Parts of an account record that SqliteStorage keeps in separate tables
+ACCOUNT_PARTS = ("account", "usage", "ranks")
+
+class StorageChanges:
+    """What changed since the last save, for backends that write per row.
+    
+    DataManager records changes here as it mutates accounts_data; backends
+    that are not incremental ignore them and write the whole document.
+    """
+    
+    def __init__(self):
+        self.full = False        # Rewrite everything
+        self.servers = False     # Server list changed
+        self.order = set()       # Servers whose account order changed
+        self.accounts = {}       # (server, id) -> (account record, set of ACCOUNT_PARTS)
+        self.deleted = set()     # (server, id) of removed accounts
+    
+    def __bool__(self):
+        return bool(self.full or self.servers or self.order or self.accounts or self.deleted)
+    
+    def account(self, server, account, parts=ACCOUNT_PARTS):
+        key = (server, account["id"])
+        self.deleted.discard(key)
+        _, changed = self.accounts.setdefault(key, (account, set()))
+        changed.update(parts)
+    
+    def delete(self, server, account_id):
+        self.accounts.pop((server, account_id), None)
+        self.deleted.add((server, account_id))
+
+def account_parts(account):
+    """Split an account record into the values stored per ACCOUNT_PARTS."""
+    rest = {key: value for key, value in account.items() if key not in ("usage", "ranks")}
+    return {
+        "account": rest,
+        "usage": account.get("usage"),
+        "ranks": account.get("ranks")
+    }
+
+class JsonStorage:
+    """All servers and accounts in one accounts.json, rewritten as a whole on every save.
+    
+    Writes are atomic, and up to backup_count rolling backups are kept.
+    With compact=True the file is written minified (with orjson when it is
+    installed) instead of indented; either layout loads.
+    """
+    
+    incremental = False
+    
+    # Minimum seconds between rolling backups, so frequent saves stay cheap
+    BACKUP_INTERVAL = 300
+    
+    def __init__(self, data_dir, backup_count=0, compact=False):
+        self.data_dir = Path(data_dir)
+        self.path = self.data_dir / JSON_FILE
+        self.compact = compact
+        # Number of rolling backup generations to keep (0 disables backups)
+        self.backup_count = backup_count
+        self._last_backup = 0
+    
+    def exists(self):
+        return self.path.exists()
+    
+    def load(self):
+        """Load accounts from JSON file, falling back to the newest readable backup."""
+        try:
+            return self._decode(self.path.read_bytes())
+        except ValueError:
+            for backup_file in self._backup_files():
+                try:
+                    data = self._decode(backup_file.read_bytes())
+                except (OSError, ValueError):
+                    continue
+                print(f"{self.path.name} is corrupt, restored from {backup_file.name}", file=sys.stderr)
+                return data
+            raise
+    
+    def _decode(self, raw):
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError (a ValueError)
+        if orjson:
+            return orjson.loads(raw)
+        return json.loads(raw)
+    
+    def serialize(self, accounts_data):
+        if not self.compact:
+            return json.dumps(accounts_data, indent=4).encode("utf-8")
+        if orjson:
+            return orjson.dumps(accounts_data)
+        return json.dumps(accounts_data, separators=(",", ":")).encode("utf-8")
+    
+    @staticmethod
+    def is_compact(path):
+        """Whether an existing accounts.json was written minified."""
+        with open(path, 'rb') as f:
+            # Indented files start with "{" and a line break
+            return f.read(2)[1:] not in (b"\n", b"\r")
+    
+    def write_all(self, accounts_data):
+        self.write(self.serialize(accounts_data))
+    
+    def write(self, payload):
+        """Write payload to a temp file, fsync it and rename it over accounts.json.
+        
+        Readers and crashes only ever see the old or the new file, never a
+        truncated one.
+        """
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.data_dir, prefix=".accounts.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            self._backup_if_due()
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    def _backup_files(self):
+        """Backup paths, newest first."""
+        return [
+            self.data_dir / f"{self.path.name}.bak{i}"
+            for i in range(1, self.backup_count + 1)
+        ]
+    
+    def _backup_if_due(self):
+        """Rotate backups and copy the current file into generation 1."""
+        if not self.backup_count or not self.path.exists():
+            return
+        now = time.monotonic()
+        if self._last_backup and now - self._last_backup < self.BACKUP_INTERVAL:
+            return
+        backups = self._backup_files()
+        for older, newer in zip(reversed(backups), reversed(backups[:-1])):
+            if newer.exists():
+                os.replace(newer, older)
+        shutil.copy2(self.path, backups[0])
+        self._last_backup = now
+    
+    def close(self):
+        pass
+
+class SqliteStorage:
+    """Accounts in an SQLite database (WAL mode), updated one row at a time.
+    
+    Servers, accounts, usage counters and ranks each have their own table,
+    so a usage increment or a rank write touches a single row. Fields other
+    than name and id are kept as JSON in accounts.data.
+    """
+    
+    incremental = True
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS servers (
+            name TEXT PRIMARY KEY,
+            position INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS accounts (
+            server TEXT NOT NULL,
+            id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (server, id)
+        );
+        CREATE INDEX IF NOT EXISTS accounts_by_position ON accounts (server, position);
+        CREATE INDEX IF NOT EXISTS accounts_by_name ON accounts (server, name);
+        CREATE TABLE IF NOT EXISTS usage (
+            server TEXT NOT NULL,
+            account_id TEXT NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (server, account_id)
+        );
+        CREATE TABLE IF NOT EXISTS ranks (
+            server TEXT NOT NULL,
+            account_id TEXT NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (server, account_id)
+        );
+    """
+    
+    # Tables keyed by (server, account_id) for each part other than "account"
+    PART_TABLES = {"usage": "usage", "ranks": "ranks"}
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self._conn = None
+    
+    def _connect(self):
+        if self._conn is None:
+            # Callers serialise access; the connection moves between threads
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Fsync at checkpoints only; a power loss may drop recent commits but never corrupts
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+        return self._conn
+    
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    def exists(self):
+        return self.path.exists()
+    
+    def load(self):
+        conn = self._connect()
+        data = {"servers": []}
+        for (name,) in conn.execute("SELECT name FROM servers ORDER BY position"):
+            data["servers"].append(name)
+            data[name] = []
+        
+        parts = {}
+        for part, table in self.PART_TABLES.items():
+            for server, account_id, value in conn.execute(f"SELECT server, account_id, data FROM {table}"):
+                parts.setdefault((server, account_id), {})[part] = json.loads(value)
+        
+        rows = conn.execute("SELECT server, id, name, data FROM accounts ORDER BY server, position")
+        for server, account_id, name, value in rows:
+            if server not in data:
+                continue
+            account = {"name": name, "id": account_id}
+            account.update(json.loads(value))
+            account.update(parts.get((server, account_id), {}))
+            data[server].append(account)
+        return data
+    
+    def write_all(self, accounts_data):
+        """Replace the stored data with accounts_data."""
+        self.apply(self._full_statements(accounts_data))
+    
+    def write_changes(self, accounts_data, changes):
+        """Apply the recorded changes in one transaction, touching only affected rows."""
+        self.apply(self.prepare_changes(accounts_data, changes))
+    
+    def prepare_changes(self, accounts_data, changes):
+        """SQL for the recorded changes, as (statement, rows) pairs for executemany.
+        
+        Only reads accounts_data, without touching the database, so callers
+        can snapshot under their data lock and apply() after releasing it.
+        """
+        if changes.full:
+            return self._full_statements(accounts_data)
+        if not changes:
+            return []
+        
+        statements = []
+        if changes.servers:
+            statements.extend(self._server_statements(accounts_data))
+            # Drop the accounts of removed servers
+            servers = list(accounts_data["servers"])
+            marks = ",".join("?" * len(servers))
+            for table in ("accounts", "usage", "ranks"):
+                statements.append((f"DELETE FROM {table} WHERE server NOT IN ({marks})", [servers]))
+        
+        for server, account_id in changes.deleted:
+            statements.append(("DELETE FROM accounts WHERE server = ? AND id = ?", [(server, account_id)]))
+            for table in self.PART_TABLES.values():
+                statements.append((f"DELETE FROM {table} WHERE server = ? AND account_id = ?", [(server, account_id)]))
+        
+        for (server, _), (account, parts) in changes.accounts.items():
+            statements.extend(self._account_statements(server, account, parts))
+        
+        for server in changes.order:
+            statements.append((
+                "UPDATE accounts SET position = ? WHERE server = ? AND id = ?",
+                [(position, server, account["id"]) for position, account in enumerate(accounts_data.get(server, []))]
+            ))
+        return statements
+    
+    def apply(self, statements):
+        """Run statements from prepare_changes() in one transaction."""
+        if not statements:
+            return
+        with self._transaction() as conn:
+            for statement, rows in statements:
+                conn.executemany(statement, rows)
+    
+    def _full_statements(self, accounts_data):
+        statements = [(f"DELETE FROM {table}", [()]) for table in ("servers", "accounts", "usage", "ranks")]
+        statements.extend(self._server_statements(accounts_data))
+        for server in accounts_data["servers"]:
+            for position, account in enumerate(accounts_data.get(server, [])):
+                statements.extend(self._account_statements(server, account, ACCOUNT_PARTS, position))
+        return statements
+    
+    def _server_statements(self, accounts_data):
+        return [
+            ("DELETE FROM servers", [()]),
+            (
+                "INSERT INTO servers (name, position) VALUES (?, ?)",
+                [(name, position) for position, name in enumerate(accounts_data["servers"])]
+            )
+        ]
+    
+    def _account_statements(self, server, account, parts, position=None):
+        values = account_parts(account)
+        account_id = account["id"]
+        statements = []
+        if "account" in parts:
+            rest = {key: value for key, value in values["account"].items() if key not in ("name", "id")}
+            # New accounts go to the end unless a position is given
+            statements.append((
+                """
+                INSERT INTO accounts (server, id, position, name, data)
+                VALUES (?, ?, COALESCE(?, (SELECT COALESCE(MAX(position) + 1, 0) FROM accounts WHERE server = ?)), ?, ?)
+                ON CONFLICT (server, id) DO UPDATE SET name = excluded.name, data = excluded.data
+                """,
+                [(server, account_id, position, server, account["name"], json.dumps(rest))]
+            ))
+        for part, table in self.PART_TABLES.items():
+            if part not in parts:
+                continue
+            if values[part] is None:
+                statements.append((f"DELETE FROM {table} WHERE server = ? AND account_id = ?", [(server, account_id)]))
+            else:
+                statements.append((
+                    f"""
+                    INSERT INTO {table} (server, account_id, data) VALUES (?, ?, ?)
+                    ON CONFLICT (server, account_id) DO UPDATE SET data = excluded.data
+                    """,
+                    [(server, account_id, json.dumps(values[part]))]
+                ))
+        return statements
+    
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+def duplicate_ids(accounts_data):
+    """(server, id) pairs used by more than one account."""
+    seen = set()
+    duplicates = []
+    for server in accounts_data["servers"]:
+        for account in accounts_data.get(server, []):
+            key = (server, account["id"])
+            if key in seen and key not in duplicates:
+                duplicates.append(key)
+            seen.add(key)
+    return duplicates
+
+def migrate_json_to_sqlite(data_dir):
+    """Import accounts.json into accounts.db, then rename it to accounts.json.migrated.
+    
+    SQLite keys accounts by (server, id), so accounts.json must not have
+    two accounts with the same id on one server; a ValueError names them
+    and nothing is changed. The database is built under a temporary name
+    and only put in place, and accounts.json renamed, once every account
+    is in it. Returns the number of accounts imported.
+    """
+    data_dir = Path(data_dir)
+    data = JsonStorage(data_dir).load()
+    duplicates = duplicate_ids(data)
+    if duplicates:
+        names = ", ".join(f"{server}/{account_id}" for server, account_id in duplicates)
+        raise ValueError(f"Cannot migrate {JSON_FILE} to SQLite: duplicate account ids {names}")
+    count = sum(len(data.get(server, [])) for server in data["servers"])
+    
+    tmp_path = data_dir / f".{SQLITE_FILE}.tmp"
+    for stale in (tmp_path, Path(f"{tmp_path}-wal"), Path(f"{tmp_path}-shm")):
+        stale.unlink(missing_ok=True)
+    storage = SqliteStorage(tmp_path)
+    try:
+        storage.write_all(data)
+        (stored,) = storage._connect().execute("SELECT COUNT(*) FROM accounts").fetchone()
+    finally:
+        storage.close()
+    if stored != count:
+        tmp_path.unlink(missing_ok=True)
+        raise ValueError(f"Migration to SQLite stored {stored} of {count} accounts; {JSON_FILE} left unchanged")
+    
+    os.replace(tmp_path, data_dir / SQLITE_FILE)
+    os.replace(data_dir / JSON_FILE, data_dir / f"{JSON_FILE}.migrated")
+    # stderr, so CLI reports on stdout stay machine-readable
+    print(f"Migrated {count} accounts from {JSON_FILE} to {SQLITE_FILE}", file=sys.stderr)
+    return count
+
+def open_storage(data_dir, kind=None, backup_count=0):
+    """Storage backend for data_dir.
+    
+    kind is "json" (indented), "compact" (minified JSON) or "sqlite". By
+    default, accounts.db is used if it exists, otherwise accounts.json in
+    the layout it already has. Switching between the JSON layouts happens
+    on the next save. Choosing "sqlite" when only accounts.json exists
+    migrates it first.
+    """
+    data_dir = Path(data_dir)
+    if kind is None:
+        if (data_dir / SQLITE_FILE).exists():
+            kind = "sqlite"
+        elif (data_dir / JSON_FILE).exists() and JsonStorage.is_compact(data_dir / JSON_FILE):
+            kind = "compact"
+        else:
+            kind = "json"
+    
+    if kind == "sqlite":
+        if not (data_dir / SQLITE_FILE).exists() and (data_dir / JSON_FILE).exists():
+            migrate_json_to_sqlite(data_dir)
+        return SqliteStorage(data_dir / SQLITE_FILE)
+    if kind in ("json", "compact"):
+        return JsonStorage(data_dir, backup_count, compact=kind == "compact")
+    raise ValueError(f"Unknown storage backend: {kind}")
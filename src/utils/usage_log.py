@@ -0,0 +1,217 @@
+import json
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from src.utils.constants import USAGE_LOG
+
+LOG_FILE = "usage_log.jsonl"
+
+# Copied field -> per-field counter in account["usage"]
+FIELD_COUNTERS = {"id": "id_copies", "password": "password_copies"}
+
+_STOP = object()
+
+def apply_copy(account, field, seq=None):
+    """Increment the account's usage counters for one copied field.
+    
+    seq is the UsageLog event being applied; it is remembered so the event
+    is never applied twice.
+    """
+    usage = account.setdefault("usage", {
+        "id_copies": 0,
+        "password_copies": 0,
+        "total_copies": 0
+    })
+    if field in FIELD_COUNTERS:
+        usage[FIELD_COUNTERS[field]] = usage.get(FIELD_COUNTERS[field], 0) + 1
+    usage["total_copies"] = usage.get("total_copies", 0) + 1
+    if seq is not None:
+        usage["log_seq"] = max(seq, usage.get("log_seq", 0))
+
+class UsageLog:
+    """Append-only log of Copy clicks, folded into the account usage counters.
+    
+    record() updates the in-memory counters and queues an event, so a click
+    never waits on the disk. A background thread appends events to
+    data/usage_log.jsonl. Every compact_interval seconds it saves the
+    counters and drops events older than the retention window. Each account
+    stores the newest event already counted (usage["log_seq"]), so
+    replaying the log on startup after a crash never counts a copy twice.
+    The retained events also answer time-windowed queries (copies()).
+    """
+    
+    def __init__(self, data_manager, path=None, compact_interval=None, retention_days=None):
+        self.data_manager = data_manager
+        self.path = Path(path) if path else data_manager.data_dir / LOG_FILE
+        self.compact_interval = compact_interval or USAGE_LOG["COMPACT_INTERVAL"]
+        self.retention = (retention_days or USAGE_LOG["RETENTION_DAYS"]) * 86400
+        
+        # Guards _seq and _recent, and orders counter updates by seq
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._recent = deque()
+        self._queue = queue.SimpleQueue()
+        
+        self._replay()
+        self._thread = threading.Thread(target=self._run, name="usage-log", daemon=True)
+        self._thread.start()
+    
+    def _replay(self):
+        """Load retained events and apply any the counters don't include yet."""
+        if not self.path.exists():
+            return
+        cutoff = time.time() - self.retention
+        applied = 0
+        with open(self.path, 'r', encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # Torn last line from a crash
+                    continue
+                self._seq = max(self._seq, event["seq"])
+                if event["ts"] >= cutoff:
+                    self._recent.append(event)
+                account = self.data_manager.get_account(event["server"], event["account"])
+                if account and event["seq"] > account.get("usage", {}).get("log_seq", 0):
+                    self.data_manager.update_account(
+                        event["server"], event["account"],
+                        lambda account: apply_copy(account, event["field"], event["seq"]),
+                        save=False
+                    )
+                    applied += 1
+        if applied:
+            # stderr, so CLI reports on stdout stay machine-readable
+            print(f"Applied {applied} logged copies to usage counters", file=sys.stderr)
+            self.data_manager.flush()
+    
+    def record(self, server, account_id, field):
+        """Count a copy of the account's "id" or "password".
+        
+        account_id may also be the account record (see DataManager.update_account()).
+        """
+        with self._lock:
+            # Nanosecond clock keeps seq increasing across restarts
+            self._seq = max(self._seq + 1, time.time_ns())
+            event = {
+                "seq": self._seq,
+                "ts": time.time(),
+                "server": server,
+                "account": account_id["id"] if isinstance(account_id, dict) else account_id,
+                "field": field
+            }
+            self._recent.append(event)
+            self.data_manager.update_account(
+                server, account_id,
+                lambda account: apply_copy(account, field, event["seq"]),
+                save=False
+            )
+        self._queue.put(event)
+    
+    def copies(self, server, account_id, seconds):
+        """Copies of the account in the last seconds (at most the retention window).
+        
+        Returns {"id": n, "password": n, "total": n}.
+        """
+        cutoff = time.time() - seconds
+        counts = {"id": 0, "password": 0, "total": 0}
+        with self._lock:
+            for event in reversed(self._recent):
+                if event["ts"] < cutoff:
+                    break
+                if event["server"] == server and event["account"] == account_id:
+                    counts[event["field"]] = counts.get(event["field"], 0) + 1
+                    counts["total"] += 1
+        return counts
+    
+    def _run(self):
+        """Append queued events and compact periodically, until close()."""
+        f = open(self.path, 'a', encoding="utf-8")
+        pending = False
+        deadline = time.monotonic() + self.compact_interval
+        try:
+            while True:
+                try:
+                    event = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    event = None
+                
+                stop = event is _STOP
+                # Drain whatever else is queued and write it in one go
+                events = [] if event is None or stop else [event]
+                while not stop:
+                    try:
+                        event = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if event is _STOP:
+                        stop = True
+                    else:
+                        events.append(event)
+                if events:
+                    f.write("".join(json.dumps(event) + "\n" for event in events))
+                    f.flush()
+                    pending = True
+                
+                if stop or time.monotonic() >= deadline:
+                    if pending:
+                        f.close()
+                        self._compact()
+                        f = open(self.path, 'a', encoding="utf-8")
+                        pending = False
+                    deadline = time.monotonic() + self.compact_interval
+                if stop:
+                    return
+        finally:
+            f.close()
+    
+    def _compact(self):
+        """Save the counters, then rewrite the log without expired events."""
+        try:
+            self.data_manager.flush()
+        except Exception as e:
+            # Keep the log; counters are rebuilt from it on the next start
+            print(f"Error saving usage counters: {str(e)}")
+            return
+        
+        cutoff = time.time() - self.retention
+        with self._lock:
+            while self._recent and self._recent[0]["ts"] < cutoff:
+                self._recent.popleft()
+        
+        with open(self.path, 'r', encoding="utf-8") as f:
+            lines = f.readlines()
+        kept = []
+        for line in lines:
+            try:
+                if json.loads(line)["ts"] >= cutoff:
+                    kept.append(line)
+            except ValueError:
+                continue
+        if len(kept) == len(lines):
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".usage_log.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding="utf-8") as f:
+                f.writelines(kept)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    def close(self):
+        """Write out queued events, save the counters and stop the thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
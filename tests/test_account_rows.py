@@ -0,0 +1,55 @@
+"""Tests for how AccountsFrame reuses account rows, without a display.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+from src.ui.frames import AccountsFrame
+
+class FakeRow:
+    """Stands in for an AccountWidget, recording what is shown in packing order."""
+    
+    def __init__(self, packed, account_data):
+        self.packed = packed
+        self.account_data = account_data
+        self.pack()
+    
+    def set_account_data(self, account_data):
+        self.account_data = account_data
+    
+    def pack(self):
+        self.packed.append(self)
+    
+    def pack_forget(self):
+        self.packed.remove(self)
+    
+    def destroy(self):
+        if self in self.packed:
+            self.packed.remove(self)
+
+def make_frame():
+    # Skip __init__, which builds the Tk widgets
+    frame = AccountsFrame.__new__(AccountsFrame)
+    frame.accounts = {}
+    frame._order = []
+    frame.packed = []
+    frame._create_account_widget = lambda parent, account_data: FakeRow(frame.packed, account_data)
+    frame.scrollable_frame = None
+    return frame
+
+def shown(frame):
+    return [row.account_data["name"] for row in frame.packed]
+
+def test_rows_for_accounts_sharing_an_id_are_all_shown():
+    frame = make_frame()
+    accounts = [{"name": "A", "id": "x"}, {"name": "B", "id": "x"}, {"name": "C", "id": "y"}]
+    
+    frame._reconcile_rows(accounts)
+    assert shown(frame) == ["A", "B", "C"]
+    
+    # Reordering reuses the rows; switching away removes them
+    rows = list(frame.packed)
+    frame._reconcile_rows([accounts[1], accounts[0], accounts[2]])
+    assert shown(frame) == ["B", "A", "C"]
+    assert sorted(map(id, frame.packed)) == sorted(map(id, rows))
+    frame._reconcile_rows([])
+    assert shown(frame) == [] and frame.accounts == {}
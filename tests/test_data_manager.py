@@ -0,0 +1,384 @@
+"""Behavioural tests for DataManager and the storage, usage log and refresh checkpoint it relies on.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import json
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from src import cli
+from src.services.rank_provider import RankProvider
+from src.services.rank_refresher import RankRefresher
+from src.services.refresh_job import RefreshCheckpoint, RefreshJob
+from src.utils import constants, io_executor
+from src.utils.data_manager import DataManager
+from src.utils.io_executor import IOExecutor
+from src.utils.storage import JSON_FILE, SQLITE_FILE, JsonStorage, SqliteStorage, open_storage
+from src.utils.usage_log import LOG_FILE
+
+def make_data_manager(data_dir, accounts=5, **kwargs):
+    data_manager = DataManager(data_dir, **kwargs)
+    with data_manager.batch():
+        data_manager.add_server("EUW")
+        for i in range(accounts):
+            data_manager.add_account("EUW", {"name": f"Player{i}#EUW", "id": f"id{i}", "password": "x"})
+    return data_manager
+
+def count_writes(data_manager):
+    """Wrap storage.write and return a list that grows by one per file write."""
+    writes = []
+    write = data_manager.storage.write
+    def counting_write(payload):
+        writes.append(len(payload))
+        write(payload)
+    data_manager.storage.write = counting_write
+    return writes
+
+class FakeProvider(RankProvider):
+    """Serves fixed ranks; accounts named in blocked wait until release is set."""
+    
+    name = "fake"
+    
+    def __init__(self, blocked=()):
+        self.blocked = set(blocked)
+        self.release = threading.Event()
+        self.fetched = []
+    
+    def fetch(self, server, account_name, cancel=None):
+        if account_name in self.blocked:
+            self.release.wait(5)
+        self.fetched.append(account_name)
+        return account_name
+    
+    def parse(self, raw):
+        return {"solo": ("gold 2", "10 LP"), "flex": None}
+
+# Batched writes (user-003)
+
+def test_batch_writes_once(tmp_path):
+    data_manager = make_data_manager(tmp_path)
+    writes = count_writes(data_manager)
+    
+    with data_manager.batch():
+        for i in range(5):
+            data_manager.update_account("EUW", f"id{i}", lambda account: account.update(name=account["name"] + "x"))
+        data_manager.move_account("EUW", "id0", 4)
+    assert len(writes) == 1
+
+def test_saves_outside_batch_write_each_time(tmp_path):
+    data_manager = make_data_manager(tmp_path)
+    writes = count_writes(data_manager)
+    
+    for i in range(3):
+        data_manager.update_account("EUW", f"id{i}", lambda account: account.update(name="renamed"))
+    assert len(writes) == 3
+
+def test_refresh_writes_once(tmp_path):
+    data_manager = make_data_manager(tmp_path, accounts=20)
+    writes = count_writes(data_manager)
+    
+    RankRefresher(data_manager, FakeProvider()).update_all_ranks()
+    assert len(writes) == 1
+    assert all(account["ranks"]["status"] == "ok" for account in data_manager.get_accounts("EUW"))
+
+def test_saves_after_io_executor_shutdown_write_inline(tmp_path):
+    data_manager = make_data_manager(tmp_path)
+    # Saves take no callbacks, so no Tk root is needed
+    executor = io_executor._shared_executor = IOExecutor(None)
+    try:
+        data_manager.update_account("EUW", "id0", lambda account: account.update(name="queued"))
+        executor.shutdown()
+        assert io_executor.get_io_executor() is None
+        data_manager.update_account("EUW", "id1", lambda account: account.update(name="inline"))
+    finally:
+        io_executor._shared_executor = None
+    saved = JsonStorage(tmp_path).load()["EUW"]
+    assert [account["name"] for account in saved[:2]] == ["queued", "inline"]
+
+# Indexes (user-006)
+
+def test_rename_keeps_other_account_with_same_name_indexed(tmp_path):
+    data_manager = DataManager(tmp_path)
+    data_manager.add_server("EUW")
+    first = {"name": "Same", "id": "a1"}
+    second = {"name": "Same", "id": "a2"}
+    data_manager.add_account("EUW", first)
+    data_manager.add_account("EUW", second)
+    
+    data_manager.update_account("EUW", "a1", lambda account: account.update(name="Other"))
+    assert data_manager.get_account_by_name("EUW", "Same") is second
+    assert data_manager.get_account_by_name("EUW", "Other") is first
+
+def test_delete_keeps_other_account_with_same_name_indexed(tmp_path):
+    data_manager = DataManager(tmp_path)
+    data_manager.add_server("EUW")
+    data_manager.add_account("EUW", {"name": "Same", "id": "a1"})
+    second = {"name": "Same", "id": "a2"}
+    data_manager.add_account("EUW", second)
+    
+    # The name index holds the last account added; deleting the other one keeps it
+    data_manager.delete_account("EUW", "a1")
+    assert data_manager.get_account("EUW", "a1") is None
+    assert data_manager.get_account_by_name("EUW", "Same") is second
+
+def test_id_change_to_taken_id_is_refused(tmp_path):
+    data_manager = make_data_manager(tmp_path, accounts=2)
+    
+    with pytest.raises(ValueError):
+        data_manager.update_account("EUW", "id0", lambda account: account.update(id="id1", name="Renamed"))
+    assert data_manager.get_account("EUW", "id0")["name"] == "Renamed"
+    assert data_manager.get_account("EUW", "id1")["name"] == "Player1#EUW"
+
+def test_id_change_moves_index_entry(tmp_path):
+    data_manager = make_data_manager(tmp_path, accounts=2)
+    account = data_manager.get_account("EUW", "id0")
+    
+    data_manager.update_account("EUW", "id0", lambda account: account.update(id="new"))
+    assert data_manager.get_account("EUW", "id0") is None
+    assert data_manager.get_account("EUW", "new") is account
+
+def write_duplicate_ids(data_dir):
+    """A legacy accounts.json where A and B share the id x."""
+    (data_dir / JSON_FILE).write_text(json.dumps({
+        "servers": ["EUW"],
+        "EUW": [{"name": "A", "id": "x"}, {"name": "B", "id": "x"}, {"name": "C", "id": "y"}]
+    }))
+
+def test_accounts_sharing_an_id_stay_reachable(tmp_path):
+    write_duplicate_ids(tmp_path)
+    data_manager = DataManager(tmp_path)
+    first, second, third = data_manager.get_accounts("EUW")
+    
+    # The id finds the first; the record picks out either
+    assert data_manager.get_account("EUW", "x") is first
+    data_manager.update_account("EUW", second, lambda account: account.update(name="B2"))
+    data_manager.record_copy("EUW", second, "password")
+    assert (first["name"], second["name"]) == ("A", "B2")
+    assert second["usage"]["password_copies"] == 1 and "usage" not in first
+    assert data_manager.move_account("EUW", second, 2)
+    assert data_manager.get_accounts("EUW") == [first, third, second]
+    
+    # Deleting one keeps the other indexed
+    assert data_manager.delete_account("EUW", first)
+    assert data_manager.get_account("EUW", "x") is second
+    assert data_manager.delete_account("EUW", "x")
+    assert data_manager.get_account("EUW", "x") is None
+    assert JsonStorage(tmp_path).load()["EUW"] == [third]
+
+def test_adding_a_taken_id_is_refused(tmp_path):
+    data_manager = make_data_manager(tmp_path, accounts=2)
+    
+    with pytest.raises(ValueError):
+        data_manager.add_account("EUW", {"name": "Other", "id": "id1"})
+    assert [account["name"] for account in data_manager.get_accounts("EUW")] == ["Player0#EUW", "Player1#EUW"]
+
+def test_refresh_reaches_accounts_sharing_an_id(tmp_path):
+    write_duplicate_ids(tmp_path)
+    data_manager = DataManager(tmp_path)
+    refresher = RankRefresher(data_manager, FakeProvider())
+    
+    job = RefreshJob(refresher, refresher.select_accounts())
+    job.run()
+    assert job.outcomes["ok"] == 3
+    assert all(account["ranks"]["status"] == "ok" for account in data_manager.get_accounts("EUW"))
+
+# Storage backends (user-020, user-021)
+
+def test_sqlite_migration_round_trip(tmp_path):
+    data_manager = make_data_manager(tmp_path)
+    data_manager.update_account("EUW", "id1", lambda account: account.update(
+        usage={"id_copies": 1, "password_copies": 2, "total_copies": 3},
+        ranks={"solo": {"rank": "Gold 2", "lp": "10 LP"}, "flex": {"rank": "Unranked", "lp": ""}}
+    ))
+    data_manager.add_server("EUNE")
+    data_manager.close()
+    expected = JsonStorage(tmp_path).load()
+    
+    migrated = DataManager(tmp_path, storage="sqlite")
+    assert isinstance(migrated.storage, SqliteStorage)
+    assert migrated.accounts_data == expected
+    assert not (tmp_path / JSON_FILE).exists()
+    assert (tmp_path / f"{JSON_FILE}.migrated").exists()
+    
+    # Row-level writes survive a reopen, found without asking for sqlite
+    migrated.update_account("EUW", "id0", lambda account: account.update(name="Renamed"))
+    migrated.move_account("EUW", "id0", 4)
+    migrated.delete_account("EUW", "id2")
+    snapshot = json.loads(json.dumps(migrated.accounts_data))
+    migrated.close()
+    reopened = DataManager(tmp_path)
+    assert reopened.accounts_data == snapshot
+    reopened.close()
+
+def test_sqlite_migration_refuses_duplicate_ids(tmp_path):
+    (tmp_path / JSON_FILE).write_text(json.dumps({
+        "servers": ["EUW"],
+        "EUW": [{"name": "A", "id": "d"}, {"name": "B", "id": "d"}]
+    }))
+    
+    with pytest.raises(ValueError, match="EUW/d"):
+        open_storage(tmp_path, "sqlite")
+    assert (tmp_path / JSON_FILE).exists()
+    assert not (tmp_path / SQLITE_FILE).exists()
+
+def test_sqlite_migration_keeps_cli_json_on_stdout_parseable(tmp_path, capsys):
+    make_data_manager(tmp_path).close()
+    capsys.readouterr()
+    
+    assert cli.main(["--data-dir", str(tmp_path), "--storage", "sqlite", "list", "--json"]) == 0
+    out, err = capsys.readouterr()
+    assert json.loads(out)
+    assert "Migrated 5 accounts" in err
+
+def test_failed_sqlite_write_is_retried(tmp_path):
+    data_manager = make_data_manager(tmp_path, storage="sqlite")
+    apply = data_manager.storage.apply
+    def locked_once(statements):
+        data_manager.storage.apply = apply
+        raise sqlite3.OperationalError("database is locked")
+    data_manager.storage.apply = locked_once
+    
+    with pytest.raises(sqlite3.OperationalError):
+        data_manager.update_account("EUW", "id0", lambda account: account.update(name="Renamed"))
+    data_manager.update_account("EUW", "id1", lambda account: account.update(name="Later"))
+    data_manager.close()
+    
+    reopened = DataManager(tmp_path)
+    assert [account["name"] for account in reopened.get_accounts("EUW")[:2]] == ["Renamed", "Later"]
+    reopened.close()
+
+def test_failed_sqlite_write_is_retried_on_close(tmp_path):
+    data_manager = make_data_manager(tmp_path, storage="sqlite")
+    apply = data_manager.storage.apply
+    def locked_once(statements):
+        data_manager.storage.apply = apply
+        raise sqlite3.OperationalError("database is locked")
+    data_manager.storage.apply = locked_once
+    
+    with pytest.raises(sqlite3.OperationalError):
+        data_manager.delete_account("EUW", "id0")
+    data_manager.close()
+    
+    reopened = DataManager(tmp_path)
+    assert reopened.get_account("EUW", "id0") is None
+    reopened.close()
+
+@pytest.mark.parametrize("kind", ["json", "sqlite"])
+def test_reads_do_not_wait_for_a_write_in_progress(tmp_path, kind):
+    data_manager = make_data_manager(tmp_path, storage=kind)
+    writing = threading.Event()
+    release = threading.Event()
+    name = "apply" if kind == "sqlite" else "write"
+    write = getattr(data_manager.storage, name)
+    def blocking_write(payload):
+        writing.set()
+        release.wait(5)
+        write(payload)
+    setattr(data_manager.storage, name, blocking_write)
+    
+    writer = threading.Thread(target=data_manager.update_account, args=("EUW", "id0", lambda account: account.update(name="x")))
+    writer.start()
+    try:
+        assert writing.wait(5)
+        reader = threading.Thread(target=lambda: (data_manager.get_accounts("EUW"), data_manager.get_account("EUW", "id1")))
+        reader.start()
+        reader.join(1)
+        assert not reader.is_alive()
+    finally:
+        release.set()
+        writer.join()
+
+@pytest.mark.parametrize("kind, compact", [("json", False), ("compact", True)])
+def test_json_layout_is_detected(tmp_path, kind, compact):
+    data_manager = make_data_manager(tmp_path, storage=kind)
+    data_manager.close()
+    
+    storage = open_storage(tmp_path)
+    assert isinstance(storage, JsonStorage)
+    assert storage.compact is compact
+    assert storage.load() == data_manager.accounts_data
+
+# Usage log (user-022)
+
+def crash_with_logged_copies(data_dir):
+    """Log three copies of EUW/id0 and stop without saving the counters."""
+    make_data_manager(data_dir).close()
+    
+    crashed = DataManager(data_dir, usage_log=True)
+    for field in ("id", "password", "password"):
+        crashed.record_copy("EUW", "id0", field)
+    # Wait for the writer thread to append the events, then "crash" without closing
+    log_path = data_dir / LOG_FILE
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and (not log_path.exists() or len(log_path.read_text().splitlines()) < 3):
+        time.sleep(0.01)
+    assert JsonStorage(data_dir).load()["EUW"][0].get("usage") is None
+
+def test_usage_log_replays_after_crash_without_double_counting(tmp_path, monkeypatch):
+    # No compaction while the test runs, so the counters only reach disk on close
+    monkeypatch.setitem(constants.USAGE_LOG, "COMPACT_INTERVAL", 3600)
+    crash_with_logged_copies(tmp_path)
+    
+    for _ in range(2):
+        restarted = DataManager(tmp_path, usage_log=True)
+        usage = restarted.get_account("EUW", "id0")["usage"]
+        assert (usage["id_copies"], usage["password_copies"], usage["total_copies"]) == (1, 2, 3)
+        assert restarted.usage_log.copies("EUW", "id0", 3600)["total"] == 3
+        restarted.close()
+
+def test_usage_log_replay_keeps_cli_json_on_stdout_parseable(tmp_path, monkeypatch, capsys):
+    monkeypatch.setitem(constants.USAGE_LOG, "COMPACT_INTERVAL", 3600)
+    crash_with_logged_copies(tmp_path)
+    capsys.readouterr()
+    
+    assert cli.main(["--data-dir", str(tmp_path), "list", "--json"]) == 0
+    out, err = capsys.readouterr()
+    assert json.loads(out)
+    assert "Applied 3 logged copies" in err
+
+# Refresh checkpoint (user-025)
+
+def test_finished_refresh_clears_checkpoint(tmp_path):
+    data_manager = make_data_manager(tmp_path)
+    refresher = RankRefresher(data_manager, FakeProvider())
+    
+    job = RefreshJob(refresher, refresher.select_accounts())
+    job.run()
+    assert job.outcomes["ok"] == 5
+    assert not job.checkpoint.path.exists()
+
+def test_cancelled_refresh_resumes_from_checkpoint(tmp_path):
+    data_manager = make_data_manager(tmp_path, accounts=6)
+    provider = FakeProvider(blocked={"Player2#EUW"})
+    refresher = RankRefresher(data_manager, provider, max_workers=1, max_per_server=1)
+    
+    job = RefreshJob(refresher, refresher.select_accounts())
+    thread = threading.Thread(target=job.run)
+    thread.start()
+    try:
+        # Player0 and Player1 finish, then the single worker blocks on Player2
+        deadline = time.monotonic() + 5
+        while len(provider.fetched) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        job.cancel()
+        assert job.wait(2)
+    finally:
+        provider.release.set()
+        thread.join()
+    
+    left = RefreshCheckpoint(tmp_path).load()
+    assert [item["account_id"] for item in left] == ["id2", "id3", "id4", "id5"]
+    # Ranks fetched before the cancel were saved with the checkpoint
+    saved = JsonStorage(tmp_path).load()["EUW"]
+    assert [account["ranks"].get("status") for account in saved[:2]] == ["ok", "ok"]
+    
+    provider.blocked.clear()
+    resumed = RefreshJob.resume(refresher)
+    assert [item["account_id"] for item in resumed.items] == ["id2", "id3", "id4", "id5"]
+    resumed.run()
+    assert not resumed.checkpoint.path.exists()
+    assert all(account["ranks"]["status"] == "ok" for account in data_manager.get_accounts("EUW"))
@@ -0,0 +1,102 @@
+"""Tests for HttpCache pruning and how it stores meta and body files.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import json
+import os
+import time
+
+from src.services.http_cache import HttpCache
+
+class FakeResponse:
+    def __init__(self, content, status_code=200, etag=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {"ETag": etag} if etag else {}
+    
+    def raise_for_status(self):
+        pass
+    
+    def close(self):
+        pass
+
+class FakeClient:
+    """Returns a new body for each URL on every request."""
+    
+    def __init__(self):
+        self.requests = 0
+    
+    def get(self, url, headers=None, **kwargs):
+        self.requests += 1
+        return FakeResponse(f"{url} #{self.requests}".encode(), etag=f'"{self.requests}"')
+
+def _files(cache, suffix):
+    return sorted(p for p in cache.cache_dir.iterdir() if p.suffix == suffix)
+
+def test_new_body_replaces_the_old_one(tmp_path):
+    cache = HttpCache(tmp_path, http_client=FakeClient(), ttl=0)
+    cache.get("https://example.com/a")
+    assert cache.get("https://example.com/a").content == b"https://example.com/a #2"
+    assert len(_files(cache, ".json")) == 1
+    assert len(_files(cache, ".body")) == 1
+
+def test_meta_never_points_at_another_responses_body(tmp_path):
+    cache = HttpCache(tmp_path, http_client=FakeClient(), ttl=0)
+    cache.get("https://example.com/a")
+    meta_path = _files(cache, ".json")[0]
+    old_meta = meta_path.read_bytes()
+    
+    # A crash after the new body was written but before the meta was replaced
+    original = cache._write_atomic
+    def crash_on_meta(path, data):
+        if str(path).endswith(".json"):
+            raise OSError("crashed")
+        original(path, data)
+    cache._write_atomic = crash_on_meta
+    try:
+        cache.get("https://example.com/a")
+    except OSError:
+        pass
+    cache._write_atomic = original
+    
+    assert meta_path.read_bytes() == old_meta
+    meta, body = cache._load("https://example.com/a")
+    assert body == b"https://example.com/a #1"
+
+def test_prune_drops_old_and_surplus_entries(tmp_path):
+    cache = HttpCache(tmp_path, http_client=FakeClient(), ttl=600)
+    for i in range(5):
+        cache.get(f"https://example.com/{i}")
+    now = time.time()
+    for age, meta_path in enumerate(sorted(_files(cache, ".json"))):
+        os.utime(meta_path, (now - age * 100, now - age * 100))
+    ages = {json.loads(p.read_text())["url"]: now - p.stat().st_mtime for p in _files(cache, ".json")}
+    
+    pruned = HttpCache(tmp_path, http_client=FakeClient(), max_entries=3, max_age=250)
+    assert pruned.prune() == 2
+    kept = {json.loads(p.read_text())["url"] for p in _files(pruned, ".json")}
+    assert kept == {url for url, age in ages.items() if age < 250}
+    assert len(_files(pruned, ".body")) == len(kept)
+    assert pruned.stats()["evicted"] == 2
+
+def test_prune_removes_orphaned_bodies(tmp_path):
+    cache = HttpCache(tmp_path, http_client=FakeClient(), ttl=600)
+    cache.get("https://example.com/a")
+    (tmp_path / "0123abcd-1.body").write_bytes(b"orphan")
+    key = _files(cache, ".json")[0].stem
+    (tmp_path / f"{key}-1.body").write_bytes(b"replaced")
+    
+    HttpCache(tmp_path, http_client=FakeClient()).prune()
+    assert len(_files(cache, ".body")) == 1
+    assert cache._load("https://example.com/a")[1] == b"https://example.com/a #1"
+
+def test_legacy_entries_are_still_read(tmp_path):
+    cache = HttpCache(tmp_path, http_client=FakeClient(), ttl=600)
+    key = cache._key("https://example.com/a")
+    (tmp_path / f"{key}.json").write_text(json.dumps({
+        "url": "https://example.com/a", "stored_at": time.time(), "etag": None,
+        "last_modified": None, "partial": False
+    }))
+    (tmp_path / f"{key}.body").write_bytes(b"legacy")
+    assert cache.get("https://example.com/a").content == b"legacy"
@@ -0,0 +1,64 @@
+"""Tests for RankMapping scores and LP parsing.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+from pathlib import Path
+
+import pytest
+
+from src.utils.rank_mapping import RankMapping, load_rank_mapping
+
+MAPPING_FILE = Path(__file__).parent.parent / "data" / "rank_mapping.json"
+
+@pytest.fixture(scope="module")
+def mapping():
+    return load_rank_mapping(MAPPING_FILE)
+
+@pytest.mark.parametrize("lp, expected", [
+    ("45 LP", 45),
+    ("1,234 LP", 1234),
+    ("-10 LP", -10),
+    ("", 0),
+    (None, 0),
+    ("LP", 0),
+])
+def test_parse_lp(lp, expected):
+    assert RankMapping.parse_lp(lp) == expected
+
+def test_scores_order_by_rank_then_lp(mapping):
+    ranks = [
+        ("Unranked", ""),
+        ("iron 4", "99 LP"),
+        ("gold 2", "0 LP"),
+        ("gold 2", "45 LP"),
+        ("Gold 1", "3 LP"),
+        ("master", "250 LP"),
+        ("grandmaster", "10 LP"),
+        ("challenger", "1,500 LP"),
+    ]
+    scores = [mapping.score(rank, lp) for rank, lp in ranks]
+    assert scores == sorted(scores)
+    assert len(set(scores)) == len(scores)
+
+def test_rank_names_are_normalised(mapping):
+    assert mapping.score("  GOLD   2 ", "10 LP") == mapping.score("gold 2", "10 LP")
+    assert mapping.clean_name("gold  2") == "Gold II"
+    assert mapping.tier_ordinal("gold 2") > mapping.tier_ordinal("silver 1")
+    assert mapping.division_ordinal("gold 1") > mapping.division_ordinal("gold 4")
+
+def test_unknown_ranks_score_as_unranked(mapping):
+    assert mapping.score("wood 9", "20 LP") == mapping.score("Unranked", "20 LP")
+    assert mapping.clean_name("wood 9") == "wood 9"
+
+def test_account_score_reads_the_queue(mapping):
+    account = {"ranks": {"solo": {"rank": "gold 2", "lp": "45 LP"}}}
+    assert mapping.account_score(account, "solo") == mapping.score("gold 2", "45 LP")
+    assert mapping.account_score(account, "flex") == mapping.score("Unranked")
+    assert mapping.account_score({}, "solo") == mapping.score("Unranked")
+
+def test_unreadable_mapping_is_empty_and_not_cached(tmp_path):
+    path = tmp_path / "rank_mapping.json"
+    assert len(load_rank_mapping(path)) == 0
+    path.write_text('{"gold 2": {"clean_name": "Gold II", "value": 18}}')
+    assert load_rank_mapping(path).value("gold 2") == 18
@@ -0,0 +1,50 @@
+"""Tests that the streaming rank parser agrees with parse_ranks.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import pytest
+
+from benchmarks.fixture_pages import SECTION, make_profile_page
+from src.services.rank_parser import SOLO_SECTION_CLASS, StreamingRankParser, parse_ranks
+
+PAGES = {
+    "both": make_profile_page(filler_rows=50),
+    "ranks last": make_profile_page(filler_rows=50, ranks_first=False),
+    "solo only": make_profile_page(flex=None, filler_rows=50),
+    "flex only": make_profile_page(solo=None, filler_rows=50),
+    "unranked": make_profile_page(solo=None, flex=None, filler_rows=50),
+    "no lp": make_profile_page(filler_rows=50).replace(b'<div class="lp">45 LP</div>', b""),
+    # Only the first section of a kind counts
+    "repeated section": make_profile_page(filler_rows=50).replace(
+        b"</body>",
+        SECTION.format(css_class=SOLO_SECTION_CLASS, title="Ranked Solo/Duo", tier="iron 4", lp="0 LP").encode() + b"</body>"
+    ),
+}
+
+def stream(page, chunk_size):
+    parser = StreamingRankParser()
+    for start in range(0, len(page), chunk_size):
+        if parser.feed(page[start:start + chunk_size]):
+            break
+    return parser.close()
+
+def test_fixture_page_ranks():
+    assert parse_ranks(PAGES["both"]) == {"solo": ("gold 2", "45 LP"), "flex": ("silver 1", "12 LP")}
+    assert parse_ranks(PAGES["no lp"])["solo"] is None
+
+@pytest.mark.parametrize("name", PAGES)
+@pytest.mark.parametrize("chunk_size", [7, 1024, 1 << 20])
+def test_streaming_matches_parse_ranks(name, chunk_size):
+    assert stream(PAGES[name], chunk_size) == parse_ranks(PAGES[name])
+
+def test_streaming_stops_once_both_sections_are_seen():
+    page = PAGES["both"]
+    parser = StreamingRankParser()
+    read = 0
+    for start in range(0, len(page), 256):
+        read += 256
+        if parser.feed(page[start:start + 256]):
+            break
+    assert parser.done
+    assert read < len(page) / 2
@@ -0,0 +1,27 @@
+"""Tests for how RankProvider classifies fetch and parse failures.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+from src.services.outcome import Outcome
+from src.services.rank_parser import StreamingRankParser
+from src.services.rank_provider import RankProvider
+
+class BrokenStreamProvider(RankProvider):
+    """Parses while fetching, like OpGGService with streaming, on a parser that fails."""
+    
+    def fetch(self, server, account_name, cancel=None):
+        parser = StreamingRankParser()
+        parser._drain = lambda: 1 / 0
+        parser.feed(b"<html><body><div>")
+        return parser
+
+class FailingFetchProvider(RankProvider):
+    def fetch(self, server, account_name, cancel=None):
+        raise ConnectionError("connection reset")
+
+def test_streaming_parse_failure_is_a_parse_error():
+    assert BrokenStreamProvider().get_ranks("EUW", "Player#EUW") == (None, Outcome.PARSE_ERROR)
+
+def test_fetch_failure_is_a_network_error():
+    assert FailingFetchProvider().get_ranks("EUW", "Player#EUW") == (None, Outcome.NETWORK_ERROR)
@@ -0,0 +1,97 @@
+"""Tests for the per-host rate limiter.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from src.services.outcome import Cancelled
+from src.services.rate_limiter import HostLimiter, TokenBucket, parse_retry_after
+
+def test_retry_after_in_seconds():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after("-3") == 0
+
+def test_retry_after_as_http_date():
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    # HTTP dates have whole seconds
+    assert 28 <= parse_retry_after(format_datetime(later, usegmt=True)) <= 30
+    earlier = datetime.now(timezone.utc) - timedelta(seconds=30)
+    assert parse_retry_after(format_datetime(earlier, usegmt=True)) == 0
+
+@pytest.mark.parametrize("value", [None, "", "soon"])
+def test_retry_after_missing_or_invalid(value):
+    assert parse_retry_after(value) is None
+
+def test_healthy_responses_raise_the_limit_additively():
+    limiter = HostLimiter(rate=100, burst=10, initial=4, maximum=6)
+    for _ in range(4):
+        limiter.record(200, 0.1)
+    # About +1 per limit's worth of requests
+    assert 4.9 < limiter.limit < 5
+    for _ in range(100):
+        limiter.record(200, 0.1)
+    assert limiter.limit == 6
+
+def test_throttling_halves_the_limit_once_per_request_time():
+    limiter = HostLimiter(rate=100, burst=10, initial=8)
+    limiter.record(200, 10)
+    limiter.record(429, 10)
+    assert int(limiter.limit) == 4
+    assert limiter.throttled == 1
+    # Within one average request time of the last decrease
+    limiter.record(503, 10)
+    assert int(limiter.limit) == 4
+
+def test_latency_spike_halves_the_limit():
+    limiter = HostLimiter(rate=100, burst=10, initial=8)
+    limiter.record(200, 0.001)
+    limiter.record(200, 1.0)  # more than SPIKE_FACTOR times the average
+    assert int(limiter.limit) == 4
+
+def test_server_errors_halve_down_to_the_minimum():
+    limiter = HostLimiter(rate=100, burst=10, initial=8, minimum=2)
+    # Instant responses, so every error is past the last decrease
+    for _ in range(5):
+        limiter.record(500, 0)
+    assert limiter.limit == 2
+
+def test_paused_bucket_waits_before_the_next_token():
+    bucket = TokenBucket(rate=1000, burst=10)
+    bucket.pause(0.2)
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.19
+
+def test_paused_bucket_stops_waiting_when_cancelled():
+    bucket = TokenBucket(rate=1000, burst=10)
+    bucket.pause(5)
+    cancel = threading.Event()
+    threading.Timer(0.05, cancel.set).start()
+    start = time.monotonic()
+    with pytest.raises(Cancelled):
+        bucket.acquire(cancel)
+    assert time.monotonic() - start < 1
+
+def test_retry_after_pauses_the_bucket():
+    limiter = HostLimiter(rate=1000, burst=10)
+    limiter.record(429, 0.01, retry_after="0.2")
+    start = time.monotonic()
+    limiter.bucket.acquire()
+    assert time.monotonic() - start >= 0.19
+
+def test_full_limiter_stops_waiting_when_cancelled():
+    limiter = HostLimiter(rate=1000, burst=10, initial=1)
+    limiter.acquire()
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(Cancelled):
+        limiter.acquire(cancel)
+    limiter.release()
+    assert limiter.in_flight == 0
@@ -0,0 +1,51 @@
+"""Tests for which accounts each RefreshPolicy selects.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+from src.services.outcome import Outcome
+from src.services.refresh_policy import RefreshPolicy
+
+NOW = 1_000_000.0
+HOUR = 3600
+
+def account(fetched_hours_ago=None, status=None, copies=0, usage_at_fetch=0):
+    ranks = {}
+    if fetched_hours_ago is not None:
+        ranks["fetched_at"] = NOW - fetched_hours_ago * HOUR
+        ranks["usage_at_fetch"] = usage_at_fetch
+    if status:
+        ranks["status"] = status
+    return {"name": "Player#EUW", "id": "p", "ranks": ranks, "usage": {"total_copies": copies}}
+
+def test_all_selects_every_account():
+    policy = RefreshPolicy.all_accounts()
+    assert policy.selects("EUW", {"name": "New", "id": "n"}, NOW)
+    assert policy.selects("EUNE", account(fetched_hours_ago=0, status=Outcome.OK), NOW)
+
+def test_stale_selects_old_and_never_fetched_accounts():
+    policy = RefreshPolicy.older_than(24)
+    assert policy.selects("EUW", account(fetched_hours_ago=25), NOW)
+    assert policy.selects("EUW", account(), NOW)
+    assert not policy.selects("EUW", account(fetched_hours_ago=23), NOW)
+
+def test_failed_selects_only_failed_outcomes():
+    policy = RefreshPolicy.failed()
+    for status in Outcome.FAILED:
+        assert policy.selects("EUW", account(fetched_hours_ago=1, status=status), NOW)
+    assert not policy.selects("EUW", account(fetched_hours_ago=1, status=Outcome.OK), NOW)
+    assert not policy.selects("EUW", account(fetched_hours_ago=1, status=Outcome.CANCELLED), NOW)
+    assert not policy.selects("EUW", account(), NOW)
+
+def test_used_since_refresh_compares_copy_counts():
+    policy = RefreshPolicy.used_since_last_refresh()
+    assert policy.selects("EUW", account(fetched_hours_ago=1, copies=3, usage_at_fetch=2), NOW)
+    assert not policy.selects("EUW", account(fetched_hours_ago=1, copies=2, usage_at_fetch=2), NOW)
+
+def test_criteria_combine_with_and():
+    policy = RefreshPolicy(servers=["EUW"], max_age_hours=24, failed_only=True)
+    stale_failure = account(fetched_hours_ago=30, status=Outcome.NETWORK_ERROR)
+    assert policy.selects("EUW", stale_failure, NOW)
+    assert not policy.selects("EUNE", stale_failure, NOW)
+    assert not policy.selects("EUW", account(fetched_hours_ago=1, status=Outcome.NETWORK_ERROR), NOW)
+    assert not policy.selects("EUW", account(fetched_hours_ago=30, status=Outcome.OK), NOW)